@@ -1,47 +1,126 @@
 """
 Analysis components for the AI Sentiment Scanner app.
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
 import pandas as pd
-from core.summarizer import summarize_themes
-from core.utils import cached_summary
+import streamlit as st
+from core.review_fetcher import fetch_reviews
+from core.analyzer import analyze_all, grouped_mean
+from core.utils import cached_summary, dedupe_texts, text_fingerprint, load_snapshot, store_snapshot, review_count
 from core.settings import COMPETITIVE_ANALYSIS_PROMPT
 
+# core.summarizer (the OpenAI SDK and client) is imported inside the functions
+# that call the LLM, so pages that never summarize do not pay for it
+
+# Use the root logger
+logger = logging.getLogger()
+
+@lru_cache(maxsize=8)
+def _make_prompt_summarizer(prompt):
+    """Return a summarizer bound to prompt, built once per distinct prompt text."""
+    from core.summarizer import summarize_themes
+
+    def summarize_with_prompt(texts):
+        return summarize_themes(texts, prompt=prompt, max_tokens=1000)
+    return summarize_with_prompt
+
 def create_sentiment_dataframe(df):
     """Create a sentiment DataFrame with date and average sentiment."""
-    sentiment_df = df.groupby("date")["sentiment"].mean().reset_index()
-    sentiment_df.columns = ["Date", "Average Sentiment"]
-    return sentiment_df
-
-def calculate_comparison_metrics(df1, df2):
-    """Calculate comparison metrics between two apps."""
-    avg_sentiment1 = df1.groupby("date")["sentiment"].mean().mean()
-    avg_sentiment2 = df2.groupby("date")["sentiment"].mean().mean()
-    review_count1 = len(df1)
-    review_count2 = len(df2)
-    engagement1 = df1['engagement'].mean()
-    engagement2 = df2['engagement'].mean()
-    
+    dates, means = grouped_mean(df["date"].to_numpy(), df["sentiment"].to_numpy())
+    return pd.DataFrame({"Date": dates, "Average Sentiment": means})
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_fetch_reviews(app_id, count=200):
+    """
+    Fetch reviews once per (app_id, count) and reuse them across reruns.
+
+    An empty result raises ValueError instead of being returned, so a
+    failed fetch is never cached and the next run retries it.
+    """
+    reviews = fetch_reviews(app_id, count=count)
+    if not reviews:
+        raise ValueError(f"No reviews returned for {app_id}")
+    return reviews
+
+def load_or_fetch_reviews(app_id, count=200):
+    """
+    Load today's snapshot of an app's reviews, or fetch and snapshot them.
+
+    Raises:
+        ValueError: If no reviews could be fetched for the app
+    """
+    reviews = load_snapshot(app_id)
+    if reviews:
+        return reviews
+    logger.info("Fetching fresh reviews for %s", app_id)
+    reviews = cached_fetch_reviews(app_id, count=count)
+    logger.info("Successfully fetched %s reviews for %s", review_count(reviews), app_id)
+    # Snapshots are named by app ID, the same key load_snapshot looks up
+    store_snapshot(app_id, reviews, review_count(reviews))
+    return reviews
+
+@st.cache_data(show_spinner=False)
+def cached_analyze_all(reviews):
+    """
+    Run analyze_all once per distinct set of fetched reviews.
+
+    The result is sorted ascending by its datetime 'date' column, so
+    callers can slice it by date and use iloc[::-1] for a newest-first
+    view instead of re-sorting on every rerun. Reviews arrive newest
+    first, so they are flipped before the stable sort to keep that
+    order exact when reversed.
+    """
+    df = analyze_all(reviews)
+    return df.iloc[::-1].sort_values('date', kind='stable', ignore_index=True)
+
+@st.cache_data(show_spinner=False)
+def cached_sentiment_dataframe(df):
+    """Build the sentiment DataFrame once per distinct period frame."""
+    return create_sentiment_dataframe(df)
+
+def calculate_comparison_metrics(metrics1, metrics2):
+    """
+    Calculate comparison metrics between two apps.
+
+    Takes the dicts returned by core.analyzer.compute_core_metrics so the
+    per-frame reductions are computed once and shared with the
+    competitive metrics display.
+    """
     return {
-        "sentiment_diff": avg_sentiment2 - avg_sentiment1,
-        "review_count_diff": review_count2 - review_count1,
-        "engagement_diff": engagement2 - engagement1
+        "sentiment_diff": metrics2["sentiment"] - metrics1["sentiment"],
+        "review_count_diff": metrics2["n"] - metrics1["n"],
+        "engagement_diff": metrics2["engagement"] - metrics1["engagement"]
     }
 
 def generate_competitive_summary(df1, df2, app_id1, app_id2, review_count, display_name1, display_name2):
     """Generate a competitive analysis summary."""
+    from core.summarizer import summarize_themes
     try:
-        # Get individual app summaries
-        summary1 = cached_summary(
-            df1["text"].tolist(),
-            summarize_themes,
-            f"{app_id1}_{review_count}"
-        )
+        # Materialize each app's distinct review texts once; the content
+        # fingerprint ties every cache entry below to this exact review set
+        texts1 = dedupe_texts(df1["text"].tolist())
+        texts2 = dedupe_texts(df2["text"].tolist())
+        fingerprint1 = text_fingerprint(texts1)
+        fingerprint2 = text_fingerprint(texts2)
         
-        summary2 = cached_summary(
-            df2["text"].tolist(),
-            summarize_themes,
-            f"{app_id2}_{review_count}"
-        )
+        # Get individual app summaries; the two LLM calls are independent,
+        # so overlap them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(
+                cached_summary,
+                texts1,
+                summarize_themes,
+                f"{app_id1}_{review_count}_{fingerprint1}"
+            )
+            future2 = executor.submit(
+                cached_summary,
+                texts2,
+                summarize_themes,
+                f"{app_id2}_{review_count}_{fingerprint2}"
+            )
+            summary1, summary2 = future1.result(), future2.result()
         
         # Create the prompt
         prompt = COMPETITIVE_ANALYSIS_PROMPT.format(
@@ -49,12 +128,10 @@ def generate_competitive_summary(df1, df2, app_id1, app_id2, review_count, displ
             app2=display_name2
         )
         
-        # Create a wrapper function that includes the prompt
-        def summarize_with_prompt(texts):
-            return summarize_themes(texts, prompt=prompt, max_tokens=1000)
+        summarize_with_prompt = _make_prompt_summarizer(prompt)
         
         # Generate competitive summary
-        cache_key = f"competitive_{app_id1}_{app_id2}_{review_count}"
+        cache_key = f"competitive_{app_id1}_{app_id2}_{review_count}_{fingerprint1}_{fingerprint2}"
         competitive_summary = cached_summary(
             [summary1, summary2],
             summarize_with_prompt,
@@ -67,11 +144,13 @@ def generate_competitive_summary(df1, df2, app_id1, app_id2, review_count, displ
 
 def generate_app_summary(df, app_id, review_count, display_name):
     """Generate a summary for a single app."""
+    from core.summarizer import summarize_themes
     try:
+        texts = dedupe_texts(df["text"].tolist())
         summary = cached_summary(
-            df["text"].tolist(),
+            texts,
             summarize_themes,
-            f"{app_id}_{review_count}"
+            f"{app_id}_{review_count}_{text_fingerprint(texts)}"
         )
         return summary
     except Exception as e:
@@ -1,12 +1,30 @@
 """
 Competitive analysis visualization components for the AI Sentiment Scanner app.
 """
+import hashlib
+from itertools import cycle
+import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from core.analyzer import compute_core_metrics
 
+# Display label and core-metric key for each metric compared between apps
+COMPARED_METRICS = (
+    ("Sentiment", "sentiment"),
+    ("Engagement", "engagement"),
+    ("Reviews", "n"),
+    ("Satisfaction", "positive_frac"),
+)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
 def create_radar_chart(metrics1, metrics2, labels):
-    """Create a radar chart comparing two apps across multiple metrics."""
+    """
+    Create a radar chart comparing two apps across multiple metrics.
+
+    The figure is cached per distinct input and shared across reruns, so
+    callers must not mutate the returned figure.
+    """
     fig = go.Figure()
     
     # Add traces for both apps
@@ -42,11 +60,10 @@ def create_radar_chart(metrics1, metrics2, labels):
 
 def create_score_cards(metrics1, metrics2, labels):
     """Create score cards showing the comparison between two apps."""
-    col1, col2, col3 = st.columns(3)
+    columns = cycle(st.columns(3))
     
-    for i, (label, score1, score2) in enumerate(zip(labels, metrics1, metrics2)):
-        col = [col1, col2, col3][i % 3]
-        with col:
+    for label, score1, score2 in zip(labels, metrics1, metrics2):
+        with next(columns):
             st.markdown(f"**{label}**")
             st.markdown(f"""
             <div class="score-card">
@@ -56,35 +73,49 @@ def create_score_cards(metrics1, metrics2, labels):
             """, unsafe_allow_html=True)
             st.markdown(f"<div class='score-label'>App 1 vs App 2</div>", unsafe_allow_html=True)
 
-def display_competitive_metrics(df1, df2):
-    """Display competitive metrics and visualizations focusing on key differentiators."""
-    # Calculate key metrics for both apps
-    metrics1 = {
-        "Sentiment": df1['sentiment'].mean(),
-        "Engagement": df1['engagement'].mean(),
-        "Reviews": len(df1),
-        "Satisfaction": (df1['sentiment'] > 0).mean(),
-    }
-    
-    metrics2 = {
-        "Sentiment": df2['sentiment'].mean(),
-        "Engagement": df2['engagement'].mean(),
-        "Reviews": len(df2),
-        "Satisfaction": (df2['sentiment'] > 0).mean(),
-    }
+def _frame_fingerprint(df):
+    """Cheap content fingerprint of the columns compute_core_metrics reads."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(np.ascontiguousarray(df['sentiment'].to_numpy(), dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(df['engagement'].to_numpy(), dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_core_metrics(fingerprint, _df):
+    """
+    Memoized compute_core_metrics.
+
+    Only the fingerprint takes part in Streamlit's cache key; the
+    underscore-prefixed frame is passed through unhashed.
+    """
+    return compute_core_metrics(_df)
+
+def get_core_metrics(df):
+    """Get the core metrics for an app's reviews, computed once per distinct frame."""
+    return _cached_core_metrics(_frame_fingerprint(df), df)
+
+def display_competitive_metrics(core1, core2):
+    """
+    Display competitive metrics and visualizations focusing on key differentiators.
+
+    Takes the precomputed dicts from get_core_metrics for each app.
+    """
+    labels = [label for label, _ in COMPARED_METRICS]
+    values1 = np.fromiter((core1[key] for _, key in COMPARED_METRICS), float, len(COMPARED_METRICS))
+    values2 = np.fromiter((core2[key] for _, key in COMPARED_METRICS), float, len(COMPARED_METRICS))
     
-    # Calculate differences and identify key differentiators
-    differences = {
-        k: abs(metrics1[k] - metrics2[k]) for k in metrics1.keys()
-    }
-    significant_diffs = {k: v for k, v in differences.items() if v > 0.1}  # Threshold for significant difference
+    # Calculate differences and identify key differentiators in one pass
+    diffs = values1 - values2
+    significant = np.flatnonzero(np.abs(diffs) > 0.1)  # Threshold for significant difference
     
-    # Display key differentiators
+    # Display key differentiators, emitting all cards in one call
     st.markdown("### Key Differences")
-    for metric in significant_diffs:
-        value1 = metrics1[metric]
-        value2 = metrics2[metric]
-        diff = value1 - value2
+    cards = []
+    for i in significant:
+        metric = labels[i]
+        value1 = values1[i]
+        value2 = values2[i]
+        diff = diffs[i]
         
         # Format the values based on metric type
         if metric in ["Sentiment", "Satisfaction"]:
@@ -96,15 +127,15 @@ def display_competitive_metrics(df1, df2):
             value2_str = f"{value2:.1f}"
             diff_str = f"{diff:+.1f}"
         else:  # Reviews
-            value1_str = f"{value1:,}"
-            value2_str = f"{value2:,}"
-            diff_str = f"{diff:+,}"
+            value1_str = f"{int(value1):,}"
+            value2_str = f"{int(value2):,}"
+            diff_str = f"{int(diff):+,}"
         
         # Determine which app is leading
         leader = "App 1" if diff > 0 else "App 2"
         diff_percent = abs(diff / ((value1 + value2) / 2)) * 100
         
-        st.markdown(f"""
+        cards.append(f"""
         <div class="differentiator-card">
             <div class="metric-name">{metric}</div>
             <div class="metric-values">
@@ -117,56 +148,7 @@ def display_competitive_metrics(df1, df2):
                 <span class="leader">({leader} +{diff_percent:.0f}%)</span>
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """)
     
-    # Add CSS for differentiator cards
-    st.markdown("""
-    <style>
-    .differentiator-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 0.5rem 0;
-    }
-    .metric-name {
-        font-weight: bold;
-        font-size: 1.1rem;
-        margin-bottom: 0.5rem;
-        color: #333;
-    }
-    .metric-values {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin: 0.5rem 0;
-    }
-    .app1-value {
-        color: #1f77b4;
-        font-weight: bold;
-        font-size: 1.2rem;
-    }
-    .app2-value {
-        color: #ff7f0e;
-        font-weight: bold;
-        font-size: 1.2rem;
-    }
-    .vs {
-        color: #666;
-        font-size: 0.9rem;
-    }
-    .metric-diff {
-        text-align: center;
-        font-size: 0.9rem;
-        color: #666;
-        margin-top: 0.5rem;
-    }
-    .diff-value {
-        font-weight: bold;
-        color: #333;
-    }
-    .leader {
-        margin-left: 0.5rem;
-        color: #333;
-    }
-    </style>
-    """, unsafe_allow_html=True) 
\ No newline at end of file
+    if cards:
+        st.markdown("".join(cards), unsafe_allow_html=True)
@@ -1,8 +1,10 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from typing import Dict, List, Tuple
-from core.version_analyzer import get_version_timeline, compare_versions
-from core.topic_analyzer import extract_topics, tag_reviews_by_theme
+from core.version_analyzer import get_version_timeline, compare_versions, version_sort_key
+from core.topic_analyzer import extract_topics, theme_score_matrix, THEME_NAMES
+from core.utils import filter_date_range
 from datetime import datetime, timedelta
 
 def display_date_range_selector() -> Tuple[datetime, datetime, datetime, datetime]:
@@ -53,6 +55,20 @@ def display_date_range_selector() -> Tuple[datetime, datetime, datetime, datetim
         datetime.combine(prev_end, datetime.max.time())
     )
 
+def _comparison_frame(items: Dict[str, Dict], label: str, before: str, after: str) -> pd.DataFrame:
+    """
+    Build a comparison table column-wise from a compare_versions section.
+    """
+    keys = list(items)
+    previous = np.fromiter((items[k]['version1'] for k in keys), float, len(keys))
+    current = np.fromiter((items[k]['version2'] for k in keys), float, len(keys))
+    return pd.DataFrame({
+        label: keys,
+        before: previous,
+        after: current,
+        'Change': current - previous
+    })
+
 def display_period_comparison(comparison: Dict) -> None:
     """
     Display period comparison results.
@@ -71,30 +87,12 @@ def display_period_comparison(comparison: Dict) -> None:
     
     # Theme Comparison
     st.subheader("🎯 Theme Analysis")
-    themes = comparison['themes']
-    theme_data = []
-    for theme, data in themes.items():
-        theme_data.append({
-            'Theme': theme,
-            'Previous Period': data['version1'],
-            'Current Period': data['version2'],
-            'Change': data['delta']
-        })
-    theme_df = pd.DataFrame(theme_data)
+    theme_df = _comparison_frame(comparison['themes'], 'Theme', 'Previous Period', 'Current Period')
     st.dataframe(theme_df.style.background_gradient(subset=['Change'], cmap='RdYlGn'))
     
     # Topic Comparison
     st.subheader("📝 Topic Analysis")
-    topics = comparison['topics']
-    topic_data = []
-    for topic, data in topics.items():
-        topic_data.append({
-            'Topic': topic,
-            'Previous Period': data['version1'],
-            'Current Period': data['version2'],
-            'Change': data['delta']
-        })
-    topic_df = pd.DataFrame(topic_data)
+    topic_df = _comparison_frame(comparison['topics'], 'Topic', 'Previous Period', 'Current Period')
     st.dataframe(topic_df.style.background_gradient(subset=['Change'], cmap='RdYlGn'))
     
     # Metrics Comparison
@@ -120,7 +118,7 @@ def display_period_summary(df: pd.DataFrame, start_date: datetime, end_date: dat
     """
     Display summary for a single period.
     """
-    period_df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    period_df = filter_date_range(df, start_date, end_date)
     
     st.markdown(f"### Period Summary ({start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')})")
     
@@ -135,11 +133,10 @@ def display_period_summary(df: pd.DataFrame, start_date: datetime, end_date: dat
     
     # Theme Distribution
     st.subheader("🎯 Theme Distribution")
-    themes = tag_reviews_by_theme(period_df['text'].tolist())
-    theme_avgs = {}
-    for theme in ['UX', 'Performance', 'Features', 'Bugs', 'Content', 'Support']:
-        scores = [score[theme] for score in themes]
-        theme_avgs[theme] = sum(scores) / len(scores) if scores else 0
+    texts = period_df['text'].to_numpy()
+    scores = theme_score_matrix(texts)
+    means = scores.mean(axis=0) if len(scores) else np.zeros(len(THEME_NAMES))
+    theme_avgs = dict(zip(THEME_NAMES, means))
     
     theme_df = pd.DataFrame([
         {'Theme': theme, 'Score': score}
@@ -149,7 +146,7 @@ def display_period_summary(df: pd.DataFrame, start_date: datetime, end_date: dat
     
     # Top Topics
     st.subheader("📝 Top Topics")
-    topics = extract_topics(period_df['text'].tolist(), n_topics=5)
+    topics = extract_topics(texts, n_topics=5)
     for topic, frequency in topics:
         st.markdown(f"- **{topic}** ({frequency:.1%} of reviews)")
 
@@ -157,8 +154,7 @@ def display_version_selector(version_groups: Dict[str, pd.DataFrame]) -> tuple:
     """
     Display version selection UI.
     """
-    versions = list(version_groups.keys())
-    versions.sort(key=lambda x: [int(n) for n in x.split('.')], reverse=True)
+    versions = sorted(version_groups, key=version_sort_key, reverse=True)
     
     col1, col2 = st.columns(2)
     with col1:
@@ -194,30 +190,12 @@ def display_version_comparison(comparison: Dict) -> None:
     
     # Theme Comparison
     st.subheader("🎯 Theme Analysis")
-    themes = comparison['themes']
-    theme_data = []
-    for theme, data in themes.items():
-        theme_data.append({
-            'Theme': theme,
-            'Version 1': data['version1'],
-            'Version 2': data['version2'],
-            'Change': data['delta']
-        })
-    theme_df = pd.DataFrame(theme_data)
+    theme_df = _comparison_frame(comparison['themes'], 'Theme', 'Version 1', 'Version 2')
     st.dataframe(theme_df.style.background_gradient(subset=['Change'], cmap='RdYlGn'))
     
     # Topic Comparison
     st.subheader("📝 Topic Analysis")
-    topics = comparison['topics']
-    topic_data = []
-    for topic, data in topics.items():
-        topic_data.append({
-            'Topic': topic,
-            'Version 1': data['version1'],
-            'Version 2': data['version2'],
-            'Change': data['delta']
-        })
-    topic_df = pd.DataFrame(topic_data)
+    topic_df = _comparison_frame(comparison['topics'], 'Topic', 'Version 1', 'Version 2')
     st.dataframe(topic_df.style.background_gradient(subset=['Change'], cmap='RdYlGn'))
     
     # Metrics Comparison
@@ -245,9 +223,15 @@ def display_version_timeline(timeline: List[Dict]) -> None:
     """
     st.subheader("📅 Version Timeline")
     timeline_df = pd.DataFrame(timeline)
-    timeline_df['date'] = pd.to_datetime(timeline_df['date'])
-    timeline_df = timeline_df.sort_values('date')
-    
-    # Display timeline
-    for _, row in timeline_df.iterrows():
-        st.markdown(f"**Version {row['version']}** - {row['date'].strftime('%Y-%m-%d')}") 
\ No newline at end of file
+    if timeline_df.empty:
+        return
+    timeline_df = timeline_df.assign(
+        date=pd.to_datetime(timeline_df['date'], cache=True)
+    ).sort_values('date', kind='stable')
+    
+    # Display timeline as a single markdown block
+    lines = (
+        "**Version " + timeline_df['version'].astype(str) + "** - "
+        + timeline_df['date'].dt.strftime('%Y-%m-%d')
+    )
+    st.markdown("\n\n".join(lines.tolist())) 
\ No newline at end of file
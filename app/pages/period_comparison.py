@@ -1,51 +1,32 @@
 import os
 import sys
-import io
+from concurrent.futures import ThreadPoolExecutor
 import re
-from datetime import datetime, timedelta
-from google_play_scraper import app
+from datetime import datetime
 
 # Add the project root directory to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(project_root)
 
 import streamlit as st
-from core.review_fetcher import fetch_reviews
-from core.analyzer import analyze_all, get_review_stats
-from core.utils import cached_summary, store_snapshot, load_snapshot
-from core.summarizer import summarize_themes, analyze_period_changes
-from core.topic_analyzer import extract_topics, analyze_topic_changes, tag_reviews_by_theme, get_period_texts
-from components.ui import setup_sidebar, display_metric_card, display_summary_box, display_section_header, setup_comparison_sidebar, display_cache_management
-from core.settings import DEFAULT_URLS
+from core.utils import cached_summary, filter_date_range, configure_logging
+from core.topic_analyzer import extract_topics, theme_score_matrix, THEME_NAMES
+from components.ui import display_summary_box, display_section_header, setup_comparison_sidebar
+import numpy as np
 import pandas as pd
 import logging
 from components.version_ui import display_period_summary
+from components.analysis import load_or_fetch_reviews, cached_analyze_all
 
-# Clear any existing handlers
-logging.getLogger().handlers = []
+# Debug logging (and the in-app debug panel) is opt-in via SENTIMENT_DEBUG
+debug_logging = bool(os.environ.get("SENTIMENT_DEBUG"))
 
-# Set up logging to capture in a string buffer
-log_stream = io.StringIO()
-handler = logging.StreamHandler(log_stream)
-handler.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-
-# Get the root logger
+# Install the logging handlers once per process; reruns reuse them
+log_buffer = st.cache_resource(show_spinner=False)(configure_logging)(debug_logging)
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
-logger.addHandler(handler)
-
-# Add console handler for direct output
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.DEBUG)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
 
-# Enable debug logging for all modules
-logging.getLogger('core').setLevel(logging.DEBUG)
-logging.getLogger('core.summarizer').setLevel(logging.DEBUG)
-logging.getLogger('core.utils').setLevel(logging.DEBUG)
+# Pattern to match Google Play Store URLs
+_APP_ID_RE = re.compile(r'play\.google\.com/store/apps/details\?id=([a-zA-Z0-9._]+)')
 
 def extract_app_id(url: str) -> str:
     """
@@ -57,18 +38,54 @@ def extract_app_id(url: str) -> str:
     Returns:
         str: Extracted app ID or None if invalid URL
     """
-    # Pattern to match Google Play Store URLs
-    pattern = r'play\.google\.com/store/apps/details\?id=([a-zA-Z0-9._]+)'
-    match = re.search(pattern, url)
+    match = _APP_ID_RE.search(url)
     if match:
         return match.group(1)
     return None
 
+def build_period_data(period_df: pd.DataFrame) -> dict:
+    """
+    Collect the metrics, topics and themes of one period for the LLM comparison.
+    
+    Args:
+        period_df: Reviews within the period
+        
+    Returns:
+        dict: Period data in the shape analyze_period_changes expects
+    """
+    texts = period_df['text'].to_numpy()
+    sentiment = period_df['sentiment'].to_numpy(dtype=np.float32)
+    rating = period_df['score'].to_numpy(dtype=np.float32)
+    return {
+        'metrics': {
+            'average_sentiment': float(sentiment.mean()),
+            'average_rating': float(rating.mean()),
+            'review_count': sentiment.size
+        },
+        'topics': dict(extract_topics(texts)),
+        'themes': dict(zip(THEME_NAMES, theme_score_matrix(texts).mean(axis=0).tolist()))
+    }
+
+def summarize_period_changes(texts, **kwargs):
+    """
+    cached_summary adapter for analyze_period_changes.
+    
+    The texts only key the cache; the period data arrives in kwargs, so
+    cached_summary folds it into the cache key as well.
+    """
+    # Imported on first use; loading the OpenAI client is slow
+    from core.summarizer import analyze_period_changes
+    return analyze_period_changes(**kwargs)
+
 # Load CSS
+@st.cache_data(show_spinner=False)
+def read_css(css_file):
+    with open(css_file) as f:
+        return f.read()
+
 def load_css():
     css_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'styles.css')
-    with open(css_file) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    st.markdown(f'<style>{read_css(css_file)}</style>', unsafe_allow_html=True)
 
 # Page configuration
 st.set_page_config(
@@ -107,133 +124,115 @@ if st.sidebar.button("Analyze App"):
         
     with st.spinner("Fetching and analyzing reviews..."):
         # Clear previous logs
-        log_stream.truncate(0)
-        log_stream.seek(0)
+        log_buffer.clear()
         
         print("\n=== Starting Period Comparison Analysis ===")
         
+        # Reuse the last analyzed frame when the same app is analyzed again today
+        run_key = (app_id, datetime.now().strftime("%Y-%m-%d"))
+        df = st.session_state.get("analyzed_df") if st.session_state.get("analyzed_key") == run_key else None
+        
         # Fetch or load reviews
         print(f"\nProcessing {app_id}...")
-        logger.info(f"Starting process for {app_id}")
-        reviews = load_snapshot(app_id)
-        if not reviews:
-            print(f"Fetching fresh reviews for {app_id}")
-            logger.info(f"Fetching fresh reviews for {app_id}")
+        logger.info("Starting process for %s", app_id)
+        if df is None:
             try:
-                reviews = fetch_reviews(app_id, count=200)  # Fetch 200 reviews by default
-                if reviews:
-                    print(f"Successfully fetched {len(reviews)} reviews for {app_id}")
-                    logger.info(f"Successfully fetched {len(reviews)} reviews for {app_id}")
-                    app_info = app(app_id)
-                    store_snapshot(app_info['title'], reviews, len(reviews))
-                else:
-                    st.error(f"Could not fetch reviews for {app_id}. Please try again later.")
-                    logger.error(f"No reviews returned for {app_id}")
-                    st.stop()
+                reviews = load_or_fetch_reviews(app_id, count=200)  # Fetch 200 reviews by default
+            except ValueError:
+                st.error(f"Could not fetch reviews for {app_id}. Please try again later.")
+                logger.error("No reviews returned for %s", app_id)
+                st.stop()
             except Exception as e:
                 st.error(f"Error fetching reviews for {app_id}: {str(e)}")
-                logger.error(f"Error fetching reviews for {app_id}: {str(e)}", exc_info=True)
+                logger.error("Error fetching reviews for %s: %s", app_id, e, exc_info=True)
                 st.stop()
 
         # Analyze reviews
         try:
-            print("\nAnalyzing reviews...")
-            logger.info("Analyzing reviews")
-            df = analyze_all(reviews)
-            
-            # Convert dates to datetime
-            df['date'] = pd.to_datetime(df['date'])
+            if df is None:
+                print("\nAnalyzing reviews...")
+                logger.info("Analyzing reviews")
+                df = cached_analyze_all(reviews)
+                st.session_state.update(analyzed_key=run_key, analyzed_df=df)
             
             # Filter for first period
-            period1_df = df[(df['date'] >= pd.Timestamp(period1_start)) & 
-                          (df['date'] <= pd.Timestamp(period1_end))]
+            period1_df = filter_date_range(df, pd.Timestamp(period1_start), pd.Timestamp(period1_end))
             
             if len(period1_df) == 0:
                 st.warning(f"No reviews found in the first period ({period1_start} to {period1_end})")
                 st.stop()
             
             # Filter for second period
-            period2_df = df[(df['date'] >= pd.Timestamp(period2_start)) & 
-                          (df['date'] <= pd.Timestamp(period2_end))]
+            period2_df = filter_date_range(df, pd.Timestamp(period2_start), pd.Timestamp(period2_end))
             
             if len(period2_df) == 0:
                 st.warning(f"No reviews found in the second period ({period2_start} to {period2_end})")
                 st.stop()
             
-            # Display comparison
-            display_section_header("Period Comparison", "⚖️")
-            
-            # Display individual period summaries side by side
-            col1, col2 = st.columns(2)
-            with col1:
-                display_period_summary(df, pd.Timestamp(period1_start), pd.Timestamp(period1_end))
-            with col2:
-                display_period_summary(df, pd.Timestamp(period2_start), pd.Timestamp(period2_end))
-            
-            # Generate and display LLM analysis
-            try:
-                period1_name = f"{period1_start.strftime('%Y-%m-%d')} to {period1_end.strftime('%Y-%m-%d')}"
-                period2_name = f"{period2_start.strftime('%Y-%m-%d')} to {period2_end.strftime('%Y-%m-%d')}"
+            # Start the LLM analysis first, so its network round-trip overlaps
+            # with rendering the period summaries below. The executor closes
+            # with this block, so its thread never outlives the script run
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                analysis_future = None
+                try:
+                    period1_name = f"{period1_start.strftime('%Y-%m-%d')} to {period1_end.strftime('%Y-%m-%d')}"
+                    period2_name = f"{period2_start.strftime('%Y-%m-%d')} to {period2_end.strftime('%Y-%m-%d')}"
+                    
+                    # Keyed on both periods' review texts and data, so a
+                    # refreshed snapshot cannot return a stale comparison
+                    analysis_future = executor.submit(
+                        cached_summary,
+                        period1_df['text'].tolist() + period2_df['text'].tolist(),
+                        summarize_period_changes,
+                        f"{app_id}_periods_{period1_start.strftime('%Y%m%d')}_{period1_end.strftime('%Y%m%d')}_{period2_start.strftime('%Y%m%d')}_{period2_end.strftime('%Y%m%d')}",
+                        period1_data=build_period_data(period1_df),
+                        period2_data=build_period_data(period2_df),
+                        period1_name=period1_name,
+                        period2_name=period2_name
+                    )
+                except Exception as e:
+                    logger.error("Error generating period comparison analysis: %s", e, exc_info=True)
+                    st.error(f"Error generating period comparison analysis: {str(e)}")
                 
-                # Prepare data for LLM analysis
-                period1_data = {
-                    'metrics': {
-                        'average_sentiment': period1_df['sentiment'].mean(),
-                        'average_rating': period1_df['score'].mean(),
-                        'review_count': len(period1_df)
-                    },
-                    'topics': dict(extract_topics(period1_df['text'].tolist())),
-                    'themes': {
-                        theme: sum(score[theme] for score in tag_reviews_by_theme(period1_df['text'].tolist())) / len(period1_df)
-                        for theme in ['UX', 'Performance', 'Features', 'Bugs', 'Content', 'Support']
-                    }
-                }
+                # Display comparison
+                display_section_header("Period Comparison", "⚖️")
                 
-                period2_data = {
-                    'metrics': {
-                        'average_sentiment': period2_df['sentiment'].mean(),
-                        'average_rating': period2_df['score'].mean(),
-                        'review_count': len(period2_df)
-                    },
-                    'topics': dict(extract_topics(period2_df['text'].tolist())),
-                    'themes': {
-                        theme: sum(score[theme] for score in tag_reviews_by_theme(period2_df['text'].tolist())) / len(period2_df)
-                        for theme in ['UX', 'Performance', 'Features', 'Bugs', 'Content', 'Support']
-                    }
-                }
+                # Display individual period summaries side by side
+                periods = [(period1_start, period1_end), (period2_start, period2_end)]
+                for col, (start, end) in zip(st.columns(2), periods):
+                    with col:
+                        display_period_summary(df, pd.Timestamp(start), pd.Timestamp(end))
                 
-                analysis = analyze_period_changes(
-                    period1_data,
-                    period2_data,
-                    period1_name,
-                    period2_name
-                )
-                
-                st.markdown("---")
-                display_section_header("AI-Powered Comparison Analysis", "🧠")
-                display_summary_box("Key Changes and Insights", analysis)
-            except Exception as e:
-                logger.error(f"Error generating period comparison analysis: {str(e)}", exc_info=True)
-                st.error(f"Error generating period comparison analysis: {str(e)}")
+                # Display LLM analysis
+                if analysis_future is not None:
+                    try:
+                        analysis = analysis_future.result()
+                        st.markdown("---")
+                        display_section_header("AI-Powered Comparison Analysis", "🧠")
+                        display_summary_box("Key Changes and Insights", analysis)
+                    except Exception as e:
+                        logger.error("Error generating period comparison analysis: %s", e, exc_info=True)
+                        st.error(f"Error generating period comparison analysis: {str(e)}")
 
         except Exception as e:
             print(f"Error analyzing reviews: {str(e)}")
-            logger.error(f"Error analyzing reviews: {str(e)}", exc_info=True)
+            logger.error("Error analyzing reviews: %s", e, exc_info=True)
             st.error(f"Error analyzing reviews: {str(e)}")
             st.stop()
 
         st.success("Analysis complete!")
 
         # Display logs
-        with st.expander("Debug Information", expanded=False):
-            st.text(log_stream.getvalue())
+        if debug_logging:
+            with st.expander("Debug Information", expanded=False):
+                st.text(log_buffer.dump())
 
         # Display raw reviews at the bottom
         display_section_header("Raw Reviews", "📄")
         st.markdown("### First Period Reviews")
-        st.dataframe(period1_df.sort_values("date", ascending=False))
+        st.dataframe(period1_df.iloc[::-1])
         st.markdown("### Second Period Reviews")
-        st.dataframe(period2_df.sort_values("date", ascending=False))
+        st.dataframe(period2_df.iloc[::-1])
 
 # Footer
 st.markdown("---")
@@ -1,27 +1,71 @@
-from textblob import TextBlob
+import os
+from functools import lru_cache
+from textblob.sentiments import PatternAnalyzer
+from joblib import Parallel, delayed
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
+# Below this many texts, worker start-up costs more than TextBlob scoring
+PARALLEL_SENTIMENT_MIN_TEXTS = 1000
+
+# TextBlob's default lexicon scorer, used without building a TextBlob per text
+_SENTIMENT_ANALYZER = PatternAnalyzer()
+
+@lru_cache(maxsize=50_000)
 def analyze_sentiment(text: str) -> float:
     """
     Analyze sentiment of a single text using TextBlob.
     
+    Scores are memoized per text, since short reviews ("good app",
+    "worst app ever") repeat heavily across fetches.
+    
     Args:
         text (str): The text to analyze
         
     Returns:
         float: Sentiment polarity (-1 to 1)
     """
-    analysis = TextBlob(text)
-    return analysis.sentiment.polarity
+    return _SENTIMENT_ANALYZER.analyze(text).polarity
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    """Score a chunk of texts in a worker process."""
+    return [analyze_sentiment(text) for text in texts]
+
+def score_sentiments(texts: List[str], n_jobs: int = None) -> np.ndarray:
+    """
+    Analyze sentiment for many texts, splitting large batches across processes.
+    
+    Each distinct text is scored once and the scores are gathered back
+    to every position, so repeated reviews cost a single array lookup.
+    
+    Args:
+        texts (List[str]): The texts to analyze
+        n_jobs (int): Worker processes to use, defaults to the CPU count
+        
+    Returns:
+        np.ndarray: Sentiment polarity (-1 to 1) for each text
+    """
+    codes, uniques = pd.factorize(np.asarray(texts, dtype=object))
+    uniques = uniques.tolist()
+    
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(uniques) < PARALLEL_SENTIMENT_MIN_TEXTS:
+        scores = np.fromiter(map(analyze_sentiment, uniques), dtype=np.float64, count=len(uniques))
+    else:
+        step = -(-len(uniques) // n_jobs)
+        chunks = [uniques[i:i + step] for i in range(0, len(uniques), step)]
+        results = Parallel(n_jobs=n_jobs)(delayed(_score_chunk)(chunk) for chunk in chunks)
+        scores = np.concatenate([np.asarray(r, dtype=np.float64) for r in results])
+    return scores[codes]
 
 def analyze_all(reviews: List[Dict]) -> pd.DataFrame:
     """
     Analyze sentiment for all reviews and return a DataFrame with results.
     
     Args:
-        reviews (List[Dict]): List of review dictionaries
+        reviews: Review columns from fetch_reviews (a list of review
+            dictionaries is also accepted)
         
     Returns:
         pd.DataFrame: DataFrame with analysis results
@@ -37,8 +81,10 @@ def analyze_all(reviews: List[Dict]) -> pd.DataFrame:
         raise ValueError("Reviews must contain 'review' field. Available fields: " + str(df.columns.tolist()))
     
     # Clean and analyze text
-    df['text'] = df['review'].astype(str)
-    df['sentiment'] = df['text'].apply(analyze_sentiment)
+    # Skip the element-wise cast when every review is already a string
+    text = df['review']
+    df['text'] = text if pd.api.types.is_string_dtype(text) else text.astype(str)
+    df['sentiment'] = score_sentiments(df['text'].tolist())
     
     # Calculate engagement score (using likes/helpful votes if available)
     if 'thumbsUpCount' in df.columns:
@@ -46,22 +92,40 @@ def analyze_all(reviews: List[Dict]) -> pd.DataFrame:
     else:
         df['engagement'] = 0
     
-    # Format dates
+    # Truncate dates to the day, keeping datetime64 so filters stay vectorized
     if 'at' in df.columns:
-        df['date'] = pd.to_datetime(df['at']).dt.strftime('%Y-%m-%d')
+        df['date'] = pd.to_datetime(df['at']).dt.normalize()
     elif 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+        df['date'] = pd.to_datetime(df['date']).dt.normalize()
     else:
-        df['date'] = pd.Timestamp.now().strftime('%Y-%m-%d')
+        df['date'] = pd.Timestamp.now().normalize()
     
     # Add reply information if available
     if 'replyContent' in df.columns:
         df['has_reply'] = df['replyContent'].notna()
         if 'repliedAt' in df.columns:
-            df['reply_date'] = pd.to_datetime(df['repliedAt']).dt.strftime('%Y-%m-%d')
+            df['reply_date'] = pd.to_datetime(df['repliedAt']).dt.normalize()
     
     return df
 
+def grouped_mean(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean of values per distinct key, for a single grouping key.
+    
+    Uses factorize + bincount, which avoids the 2-D GroupBy path pandas
+    takes even when only one column is aggregated.
+    
+    Args:
+        keys (np.ndarray): Grouping key for each row
+        values (np.ndarray): Numeric value for each row
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sorted distinct keys and their means
+    """
+    codes, uniques = pd.factorize(np.ascontiguousarray(keys), sort=True)
+    weights = np.ascontiguousarray(values, dtype=np.float64)
+    return uniques, np.bincount(codes, weights=weights) / np.bincount(codes)
+
 def get_review_stats(df: pd.DataFrame) -> Dict:
     """
     Calculate review statistics.
@@ -72,16 +136,42 @@ def get_review_stats(df: pd.DataFrame) -> Dict:
     Returns:
         Dict: Dictionary of statistics
     """
+    # Reduce each column once on its ndarray instead of through pandas dispatch
+    n = len(df)
+    sentiment = df['sentiment'].to_numpy(dtype=np.float64)
+    engagement = df['engagement'].to_numpy(dtype=np.float64)
+    rating = None
+    if 'score' in df.columns:
+        rating = df['score'].to_numpy(dtype=np.float64).mean() if n else np.nan
     stats = {
-        'total_reviews': len(df),
-        'average_rating': df['score'].mean() if 'score' in df.columns else None,
-        'average_sentiment': df['sentiment'].mean(),
-        'average_engagement': df['engagement'].mean(),
-        'reply_rate': df['has_reply'].mean() if 'has_reply' in df.columns else 0,
-        'most_engaged_review': df.loc[df['engagement'].idxmax()]['text'] if 'engagement' in df.columns else None
+        'total_reviews': n,
+        'average_rating': rating,
+        'average_sentiment': sentiment.mean() if n else np.nan,
+        'average_engagement': engagement.mean() if n else np.nan,
+        'reply_rate': np.count_nonzero(df['has_reply'].to_numpy()) / n if 'has_reply' in df.columns and n else 0,
+        'most_engaged_review': df['text'].iat[int(engagement.argmax())] if n else None
     }
     return stats
 
+def compute_core_metrics(df: pd.DataFrame) -> Dict:
+    """
+    Calculate the per-app scalars shared by the comparison views.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with review data
+        
+    Returns:
+        Dict: Mean sentiment, mean engagement, review count and the
+            fraction of positive reviews
+    """
+    sentiment = df['sentiment'].to_numpy()
+    return {
+        'sentiment': sentiment.mean(),
+        'engagement': df['engagement'].to_numpy().mean(),
+        'n': sentiment.size,
+        'positive_frac': (sentiment > 0).mean()
+    }
+
 def get_rating_distribution(df: pd.DataFrame) -> pd.Series:
     """
     Get the distribution of ratings.
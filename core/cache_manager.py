@@ -2,6 +2,7 @@
 Cache management functions for the AI Sentiment Scanner app.
 """
 import os
+import shutil
 import logging
 
 # Use the root logger
@@ -13,12 +14,10 @@ def clear_cache() -> None:
     """
     try:
         snapshots_dir = "data/snapshots"
-        if os.path.exists(snapshots_dir):
-            for filename in os.listdir(snapshots_dir):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(snapshots_dir, filename)
-                    os.remove(file_path)
-                    logger.info(f"Removed cache file: {filename}")
+        if os.path.isdir(snapshots_dir):
+            # The directory only holds snapshots, so drop it wholesale
+            shutil.rmtree(snapshots_dir)
+            os.makedirs(snapshots_dir, exist_ok=True)
             logger.info("Cache cleared successfully")
     except Exception as e:
         logger.error(f"Error clearing cache: {str(e)}", exc_info=True)
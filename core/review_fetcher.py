@@ -1,23 +1,29 @@
 import os
 import ssl
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
 from google_play_scraper import app, reviews, Sort
 import pandas as pd
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Fix SSL certificate verification for macOS
+# Python builds on macOS often ship without a CA bundle; verify against
+# certifi's bundle when it is installed instead of disabling verification
 try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
+    import certifi
+except ImportError:
     pass
 else:
-    ssl._create_default_https_context = _create_unverified_https_context
+    def _create_certifi_https_context(*args, **kwargs):
+        kwargs.setdefault('cafile', certifi.where())
+        return ssl.create_default_context(*args, **kwargs)
+    ssl._create_default_https_context = _create_certifi_https_context
 
-def fetch_reviews(app_id: str, count: int = 200) -> List[Dict]:
+# Fetching is network-bound, so a few threads overlap the requests
+FETCH_MAX_WORKERS = 4
+
+def fetch_reviews(app_id: str, count: int = 200) -> Dict[str, List[Any]]:
     """
     Fetch reviews for a specific app from Google Play Store.
     
@@ -26,64 +32,82 @@ def fetch_reviews(app_id: str, count: int = 200) -> List[Dict]:
         count: Number of reviews to fetch
         
     Returns:
-        List[Dict]: List of review dictionaries
+        Dict[str, List[Any]]: Review fields as parallel column lists, or an
+        empty dict if nothing was fetched
     """
     try:
         logger.info(f"Fetching reviews for app: {app_id}")
         
-        # First, verify the app exists
+        # Verify the app exists while the reviews are fetched, rather than
+        # paying for the two round trips one after the other
+        executor = ThreadPoolExecutor(max_workers=1)
         try:
-            app_info = app(app_id)
-            logger.info(f"Found app: {app_info['title']}")
-        except Exception as e:
-            logger.error(f"Error fetching app info for {app_id}: {str(e)}")
-            return []
+            reviews_future = executor.submit(
+                reviews,
+                app_id,
+                lang='en',  # Language
+                country='sg',  # Country
+                count=count,  # Number of reviews
+                sort=Sort.NEWEST,  # Sort by newest
+                filter_score_with=None  # Get all scores
+            )
+            try:
+                app_info = app(app_id)
+                logger.info(f"Found app: {app_info['title']}")
+            except Exception as e:
+                logger.error(f"Error fetching app info for {app_id}: {str(e)}")
+                return {}
 
-        # Fetch reviews
-        result, continuation_token = reviews(
-            app_id,
-            lang='en',  # Language
-            country='sg',  # Country
-            count=count,  # Number of reviews
-            sort=Sort.NEWEST,  # Sort by newest
-            filter_score_with=None  # Get all scores
-        )
+            result, continuation_token = reviews_future.result()
+        finally:
+            # A running fetch cannot be cancelled; don't wait for it when the
+            # app lookup failed, its result is simply discarded
+            executor.shutdown(wait=False, cancel_futures=True)
         
         if not result:
             logger.warning(f"No reviews found for app: {app_id}")
-            return []
+            return {}
             
         logger.info(f"Fetched {len(result)} reviews for {app_id}")
         
-        # Process reviews into a consistent format
-        processed_reviews = []
+        # Process reviews into a consistent format, one list per field, so
+        # the analyzer builds its DataFrame column-wise
+        columns = texts, scores, thumbs, ats, replies, replied_ats = [], [], [], [], [], []
         for review in result:
             try:
-                processed_review = {
-                    'review': review.get('content', ''),
-                    'score': review.get('score', 0),
-                    'thumbsUpCount': review.get('thumbsUpCount', 0),
-                    'at': review.get('at', ''),
-                    'replyContent': review.get('replyContent', ''),
-                    'repliedAt': review.get('repliedAt', '')
-                }
-                processed_reviews.append(processed_review)
+                row = (
+                    review.get('content', ''),
+                    review.get('score', 0),
+                    review.get('thumbsUpCount', 0),
+                    review.get('at', ''),
+                    review.get('replyContent', ''),
+                    review.get('repliedAt', '')
+                )
             except Exception as e:
                 logger.error(f"Error processing review: {str(e)}")
                 continue
+            for column, value in zip(columns, row):
+                column.append(value)
         
-        if not processed_reviews:
+        if not texts:
             logger.warning(f"No valid reviews processed for app: {app_id}")
-            return []
+            return {}
             
-        logger.info(f"Successfully processed {len(processed_reviews)} reviews for {app_id}")
-        return processed_reviews
+        logger.info(f"Successfully processed {len(texts)} reviews for {app_id}")
+        return {
+            'review': texts,
+            'score': scores,
+            'thumbsUpCount': thumbs,
+            'at': ats,
+            'replyContent': replies,
+            'repliedAt': replied_ats
+        }
     
     except Exception as e:
         logger.error(f"Error fetching reviews for {app_id}: {str(e)}")
-        return []
+        return {}
 
-def fetch_multiple_apps(app_ids: List[str], count: int = 200) -> Dict[str, List[Dict]]:
+def fetch_multiple_apps(app_ids: List[str], count: int = 200) -> Dict[str, Dict[str, List[Any]]]:
     """
     Fetch reviews for multiple apps.
     
@@ -92,11 +116,12 @@ def fetch_multiple_apps(app_ids: List[str], count: int = 200) -> Dict[str, List[
         count: Number of reviews to fetch per app
         
     Returns:
-        Dict[str, List[Dict]]: Dictionary mapping app IDs to their reviews
+        Dict[str, Dict[str, List[Any]]]: Dictionary mapping app IDs to their review columns
     """
     all_reviews = {}
-    for app_id in app_ids:
-        reviews = fetch_reviews(app_id, count)
-        if reviews:  # Only add if we got reviews
-            all_reviews[app_id] = reviews
+    with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as executor:
+        results = executor.map(lambda app_id: fetch_reviews(app_id, count), app_ids)
+        for app_id, app_reviews in zip(app_ids, results):
+            if app_reviews:  # Only add if we got reviews
+                all_reviews[app_id] = app_reviews
     return all_reviews 
\ No newline at end of file
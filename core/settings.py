@@ -10,6 +10,9 @@ load_dotenv()
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Chat model used for summaries; gpt-4o-mini supports automatic prompt caching
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "gpt-4o-mini")
+
 # Cache settings
 CACHE_DIR = "data/summaries"
 SNAPSHOT_DIR = "data/snapshots"
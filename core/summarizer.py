@@ -1,8 +1,19 @@
 import openai
-from .settings import OPENAI_API_KEY
-from typing import List, Dict
+import httpx
+from .settings import OPENAI_API_KEY, CACHE_DIR, SUMMARIZER_MODEL
+from .utils import read_json, write_json
+from typing import List, Dict, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import hashlib
+import io
 import logging
 import json
+import os
+import re
+import threading
+import time
 
 # Use the root logger
 logger = logging.getLogger()
@@ -11,14 +22,261 @@ logger = logging.getLogger()
 try:
     client = openai.OpenAI(
         api_key=OPENAI_API_KEY,
-        timeout=30.0,  # Add timeout
-        max_retries=3  # Add retries
+        # Fail fast on connect, but give completions the full 30 seconds
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        max_retries=3,  # Add retries
+        # Share one connection pool, sized for concurrent summaries
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
     )
+    # Close the pooled connections cleanly when the process exits
+    atexit.register(client.close)
     logger.info("OpenAI client initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize OpenAI client: {str(e)}")
     raise
 
+# Static instructions live in the system messages and every per-call value
+# goes last, in the user message, so repeated requests share a cacheable
+# prompt prefix
+SUMMARIZE_SYSTEM_PROMPT = """You are an expert app review analyst.
+
+Analyze the app reviews you are given and provide a comprehensive summary focusing on:
+1. Overall sentiment and user satisfaction
+2. Key features and functionality mentioned
+3. Common issues and pain points
+4. User suggestions and feature requests
+5. Notable trends or patterns in the feedback
+
+Format the response in clear sections with bullet points for easy reading."""
+
+COMPARE_SYSTEM_PROMPT = """You are a competitive analysis expert specializing in app reviews.
+
+Compare the reviews of the two apps you are given.
+Focus on:
+1. Overall satisfaction levels
+2. Common issues and complaints
+3. Unique strengths of each app
+4. Feature comparison
+5. Customer service quality
+6. Areas for improvement
+
+Please provide a structured comparison with these sections."""
+
+COMPETITORS_SYSTEM_PROMPT = """You are a competitive intelligence analyst.
+
+Analyze the tweets you are given to understand the competitive positioning of the listed competitors.
+Focus on:
+1. Market positioning and differentiation
+2. Product/service offerings
+3. Customer engagement strategies
+4. Competitive advantages
+5. Areas of potential improvement
+
+Please provide a structured competitive analysis."""
+
+PERIOD_CHANGES_SYSTEM_PROMPT = """You are an expert app analytics specialist who excels at identifying meaningful patterns and changes in user feedback.
+
+Analyze the changes between the two periods of an app's reviews you are given.
+Please provide a comprehensive analysis that:
+1. Highlights the most significant changes and their implications
+2. Identifies emerging trends or issues
+3. Suggests potential areas for improvement
+4. Explains the impact of these changes on user satisfaction
+5. Provides actionable insights for the development team
+
+Format the response in clear sections with bullet points for easy reading."""
+
+# Maximum number of completion requests summarize_many keeps in flight
+SUMMARY_CONCURRENCY = 10
+
+# Client-side request and token budgets, kept under the account's limits
+OPENAI_REQUESTS_PER_MINUTE = 3000
+OPENAI_TOKENS_PER_MINUTE = 90000
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills continuously over a period.
+    
+    acquire() blocks until the requested amount is available, so callers
+    are paced at the limit instead of being rejected with a 429.
+    """
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        # A request larger than the bucket waits for a full bucket
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+_request_limiter = TokenBucket(OPENAI_REQUESTS_PER_MINUTE)
+_token_limiter = TokenBucket(OPENAI_TOKENS_PER_MINUTE)
+
+def _estimate_tokens(system: str, user: str, max_tokens: int) -> int:
+    """Rough token cost of a request: ~4 characters per prompt token plus the response budget."""
+    return (len(system) + len(user)) // 4 + max_tokens
+
+# Completions kept in memory, most recently used last
+COMPLETION_MEMORY_SIZE = 128
+_completions = OrderedDict()
+_completions_lock = threading.Lock()
+
+def _completion_key(system: str, user: str, max_tokens: int, model: str, temperature: float) -> str:
+    """Hash a chat completion request into its cache key."""
+    request = json.dumps([model, max_tokens, temperature, system, user])
+    return hashlib.blake2b(request.encode(), digest_size=16).hexdigest()
+
+def _remember_completion(key: str, content: str) -> None:
+    """Insert a completion into the in-memory LRU."""
+    with _completions_lock:
+        _completions[key] = content
+        _completions.move_to_end(key)
+        while len(_completions) > COMPLETION_MEMORY_SIZE:
+            _completions.popitem(last=False)
+
+def clear_completion_cache() -> None:
+    """Forget every completion held in memory."""
+    with _completions_lock:
+        _completions.clear()
+
+def _cache_completion(key: str, content: str) -> None:
+    """Persist a completion to CACHE_DIR and remember it in memory."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_json(os.path.join(CACHE_DIR, f"completion_{key}.json"), {"content": content})
+    except Exception as e:
+        logger.error(f"Error caching completion: {str(e)}")
+    _remember_completion(key, content)
+
+def _chat_completion(system: str, user: str, max_tokens: int, model: str = SUMMARIZER_MODEL, temperature: float = 0.7) -> str:
+    """
+    Get a chat completion, reusing an earlier response to the identical request.
+    
+    Responses are cached in memory (LRU) and as JSON files in CACHE_DIR,
+    keyed by a blake2b hash of the model, sampling settings and messages.
+    
+    Args:
+        system: System message
+        user: User message
+        max_tokens: Maximum tokens for the response
+        model: Model name
+        temperature: Sampling temperature
+        
+    Returns:
+        str: The completion text
+    """
+    key = _completion_key(system, user, max_tokens, model, temperature)
+    
+    with _completions_lock:
+        if key in _completions:
+            _completions.move_to_end(key)
+            return _completions[key]
+    
+    path = os.path.join(CACHE_DIR, f"completion_{key}.json")
+    content = None
+    try:
+        content = read_json(path).get("content")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable completion cache file {path}: {str(e)}")
+    
+    if content is not None:
+        logger.info("Loaded completion from cache")
+        _remember_completion(key, content)
+        return content
+    
+    # Pace requests under the rate limits; the client still retries any
+    # 429 that gets through with exponential backoff (max_retries)
+    _request_limiter.acquire()
+    _token_limiter.acquire(_estimate_tokens(system, user, max_tokens))
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature
+    )
+    content = response.choices[0].message.content
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if usage is not None:
+        logger.debug(
+            "Completion used %s prompt tokens (%s cached)",
+            usage.prompt_tokens,
+            getattr(details, "cached_tokens", 0) or 0
+        )
+    _cache_completion(key, content)
+    return content
+
+# Truncate long reviews and limit total text length
+MAX_REVIEW_LENGTH = 1000  # Increased from 500 to 1000 characters per review
+MAX_TOTAL_LENGTH = 20000  # Increased from 10000 to 20000 characters total
+
+def _write_reviews(buffer: io.StringIO, texts: List[str], max_total_length: int = MAX_TOTAL_LENGTH) -> None:
+    """
+    Write truncated reviews to a buffer, separated by blank lines.
+    
+    Args:
+        buffer: Buffer the reviews are written to
+        texts: List of review texts
+        max_total_length: Character budget for all reviews together
+    """
+    total_length = 0
+    
+    for text in texts:
+        # Truncate long reviews
+        if len(text) > MAX_REVIEW_LENGTH:
+            text = text[:MAX_REVIEW_LENGTH] + "..."
+        
+        # Check if adding this review would exceed the total limit
+        if total_length + len(text) + 2 > max_total_length:  # +2 for newlines
+            break
+            
+        if total_length:
+            buffer.write("\n\n")
+        buffer.write(text)
+        total_length += len(text) + 2  # +2 for newlines
+
+def _summary_messages(texts: List[str], prompt: str = None) -> Tuple[str, str]:
+    """
+    Build the system and user messages for summarizing review texts.
+    
+    Args:
+        texts: List of review texts
+        prompt: Optional custom prompt
+        
+    Returns:
+        Tuple[str, str]: The system message and the user message
+    """
+    # Write the user message in one buffer
+    buffer = io.StringIO()
+    buffer.write("Reviews:\n")
+    _write_reviews(buffer, texts)
+    
+    # Use custom prompt if provided, otherwise use default
+    if prompt is None:
+        system = SUMMARIZE_SYSTEM_PROMPT
+    else:
+        system = f"You are an expert app review analyst.\n\n{prompt}"
+    return system, buffer.getvalue()
+
 def summarize_themes(texts: List[str], prompt: str = None, max_tokens: int = 2000) -> str:
     """
     Generate a summary of themes from review texts using GPT-4.
@@ -35,56 +293,12 @@ def summarize_themes(texts: List[str], prompt: str = None, max_tokens: int = 200
         # Log the number of texts being processed
         logger.info(f"Processing {len(texts)} texts for summarization")
         
-        # Truncate long reviews and limit total text length
-        MAX_REVIEW_LENGTH = 1000  # Increased from 500 to 1000 characters per review
-        MAX_TOTAL_LENGTH = 20000  # Increased from 10000 to 20000 characters total
-        
-        processed_texts = []
-        total_length = 0
-        
-        for text in texts:
-            # Truncate long reviews
-            if len(text) > MAX_REVIEW_LENGTH:
-                text = text[:MAX_REVIEW_LENGTH] + "..."
-            
-            # Check if adding this review would exceed the total limit
-            if total_length + len(text) + 2 > MAX_TOTAL_LENGTH:  # +2 for newlines
-                break
-                
-            processed_texts.append(text)
-            total_length += len(text) + 2  # +2 for newlines
-        
-        # Join all texts with newlines
-        combined_text = "\n\n".join(processed_texts)
-        
-        # Use custom prompt if provided, otherwise use default
-        if prompt is None:
-            prompt = """Analyze the following app reviews and provide a comprehensive summary focusing on:
-            1. Overall sentiment and user satisfaction
-            2. Key features and functionality mentioned
-            3. Common issues and pain points
-            4. User suggestions and feature requests
-            5. Notable trends or patterns in the feedback
-            
-            Format the response in clear sections with bullet points for easy reading."""
-        
-        # Create the full prompt
-        full_prompt = f"{prompt}\n\nReviews:\n{combined_text}"
+        system, user = _summary_messages(texts, prompt)
         
         # Make the API call
         logger.info("Making API call to OpenAI for summarization")
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert app review analyst."},
-                {"role": "user", "content": full_prompt}
-            ],
-            max_tokens=max_tokens,
-            temperature=0.7
-        )
+        summary = _chat_completion(system, user, max_tokens)
         
-        # Extract and return the generated summary
-        summary = response.choices[0].message.content
         logger.info("Successfully generated summary")
         return summary
         
@@ -92,6 +306,74 @@ def summarize_themes(texts: List[str], prompt: str = None, max_tokens: int = 200
         logger.error(f"Error in summarize_themes: {str(e)}", exc_info=True)
         raise
 
+def summarize_many(text_lists: List[List[str]], prompt: str = None, max_tokens: int = 2000) -> List[str]:
+    """
+    Summarize several independent review sets concurrently.
+    
+    The API calls are network-bound, so up to SUMMARY_CONCURRENCY of them
+    run at once on threads sharing the client's connection pool.
+    
+    Args:
+        text_lists: One list of review texts per summary
+        prompt: Optional custom prompt, shared by every summary
+        max_tokens: Maximum tokens for each response
+        
+    Returns:
+        List[str]: Generated summaries, in the order of text_lists
+    """
+    if not text_lists:
+        return []
+    with ThreadPoolExecutor(max_workers=min(SUMMARY_CONCURRENCY, len(text_lists))) as executor:
+        return list(executor.map(lambda texts: summarize_themes(texts, prompt, max_tokens), text_lists))
+
+def summarize_themes_multi(text_lists: List[List[str]], labels: List[str], max_tokens: int = 4000) -> Dict[str, str]:
+    """
+    Summarize several review sets with a single chat request.
+    
+    Uses one request (and one copy of the instructions) instead of one per
+    set, for when the request rate rather than the token rate is the
+    limit. The review budget is split evenly between the sets, and the
+    model is asked to start each summary with a "### <label>" line so the
+    response can be split back up.
+    
+    Args:
+        text_lists: One list of review texts per summary
+        labels: A unique label for each review set
+        max_tokens: Maximum tokens for the whole response
+        
+    Returns:
+        Dict[str, str]: Summary by label; sets the model skipped are missing
+    """
+    if not text_lists:
+        return {}
+    
+    system = (
+        f"{SUMMARIZE_SYSTEM_PROMPT}\n\n"
+        "You will be given several labelled review sets. Summarize each one separately, "
+        "starting each summary with a line of the form \"### <label>\"."
+    )
+    
+    buffer = io.StringIO()
+    budget = MAX_TOTAL_LENGTH // len(text_lists)
+    for i, (label, texts) in enumerate(zip(labels, text_lists), 1):
+        buffer.write(f"<<SET {i}: {label}>>\nReviews:\n")
+        _write_reviews(buffer, texts, budget)
+        buffer.write("\n\n")
+    
+    logger.info(f"Making one API call to OpenAI for {len(text_lists)} summaries")
+    response = _chat_completion(system, buffer.getvalue(), max_tokens)
+    
+    # Split the response on the "### <label>" headings, and only on those:
+    # the model may add "### " subheadings of its own inside a summary
+    heading_re = re.compile(r'^### (' + '|'.join(map(re.escape, labels)) + r')\s*$', re.MULTILINE)
+    parts = heading_re.split(response)
+    summaries = {label: body.strip() for label, body in zip(parts[1::2], parts[2::2])}
+    
+    missing = set(labels).difference(summaries)
+    if missing:
+        logger.warning(f"Combined summary response had no section for: {', '.join(sorted(missing))}")
+    return summaries
+
 def compare_apps(texts1: List[str], texts2: List[str], app_names: List[str], max_tokens: int = 1000) -> str:
     """
     Generate a comparative analysis of two apps' reviews using GPT-4.
@@ -121,54 +403,27 @@ def compare_apps(texts1: List[str], texts2: List[str], app_names: List[str], max
         logger.debug(f"Total text length for {app_names[1]}: {len(joined2)} characters")
         
         # Create the prompt
-        prompt = f"""Compare the reviews of {app_names[0]} and {app_names[1]} apps.
-Focus on:
-1. Overall satisfaction levels
-2. Common issues and complaints
-3. Unique strengths of each app
-4. Feature comparison
-5. Customer service quality
-6. Areas for improvement
-
-{app_names[0]} Reviews:
+        prompt = f"""{app_names[0]} Reviews:
 {joined1}
 
 {app_names[1]} Reviews:
-{joined2}
-
-Please provide a structured comparison with these sections."""
+{joined2}"""
         
         logger.info("Sending comparison request to OpenAI API")
         logger.debug(f"Prompt length: {len(prompt)} characters")
         
         # Get completion from OpenAI
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a competitive analysis expert specializing in app reviews."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_tokens,
-            temperature=0.7
-        )
-        
-        logger.debug(f"OpenAI API response: {json.dumps(response, indent=2)}")
-        
-        if not response or 'choices' not in response or not response['choices']:
-            logger.error("Invalid response from OpenAI API")
-            return "Error: Invalid response from OpenAI API"
-            
-        comparison = response['choices'][0].message.content
+        comparison = _chat_completion(COMPARE_SYSTEM_PROMPT, prompt, max_tokens)
         logger.info(f"Successfully generated comparison of length: {len(comparison)}")
         return comparison
         
-    except openai.error.AuthenticationError:
+    except openai.AuthenticationError:
         logger.error("OpenAI API authentication failed. Please check your API key.")
         return "Error: Invalid API key. Please check your configuration."
-    except openai.error.RateLimitError:
+    except openai.RateLimitError:
         logger.error("OpenAI API rate limit exceeded")
         return "Error: API rate limit exceeded. Please try again later."
-    except openai.error.APIError as e:
+    except openai.APIError as e:
         logger.error(f"OpenAI API error: {str(e)}")
         return f"Error: API error occurred. Please try again later. Details: {str(e)}"
     except Exception as e:
@@ -182,31 +437,13 @@ def analyze_competitors(tweets: List[str], competitors: List[str], max_tokens: i
         joined = "\n".join(tweets)
         
         # Create the prompt
-        prompt = f"""Analyze the following tweets to understand competitive positioning for {', '.join(competitors)}.
-Focus on:
-1. Market positioning and differentiation
-2. Product/service offerings
-3. Customer engagement strategies
-4. Competitive advantages
-5. Areas of potential improvement
+        prompt = f"""Competitors: {', '.join(competitors)}
 
 Tweets:
-{joined}
-
-Please provide a structured competitive analysis."""
+{joined}"""
         
         # Get completion from OpenAI
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a competitive intelligence analyst."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_tokens,
-            temperature=0.7
-        )
-        
-        return response['choices'][0].message.content
+        return _chat_completion(COMPETITORS_SYSTEM_PROMPT, prompt, max_tokens)
     except Exception as e:
         print(f"Error generating competitive analysis: {str(e)}")
         return "Error generating competitive analysis. Please try again."
@@ -256,7 +493,7 @@ def analyze_period_changes(
                     theme_changes.append(f"{theme}: {data:.2f} → {period2_data['themes'][theme]:.2f} (Δ: {delta:+.2f})")
 
         # Create the prompt
-        prompt = f"""Analyze the changes between {period1_name} and {period2_name} for this app's reviews.
+        prompt = f"""Periods: {period1_name} → {period2_name}
 
 Key Metrics Changes:
 {chr(10).join(metrics_changes)}
@@ -265,32 +502,13 @@ Significant Topic Changes:
 {chr(10).join(topic_changes)}
 
 Theme Changes:
-{chr(10).join(theme_changes)}
-
-Please provide a comprehensive analysis that:
-1. Highlights the most significant changes and their implications
-2. Identifies emerging trends or issues
-3. Suggests potential areas for improvement
-4. Explains the impact of these changes on user satisfaction
-5. Provides actionable insights for the development team
-
-Format the response in clear sections with bullet points for easy reading."""
+{chr(10).join(theme_changes)}"""
 
         # Get completion from OpenAI
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert app analytics specialist who excels at identifying meaningful patterns and changes in user feedback."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_tokens,
-            temperature=0.7
-        )
-
-        analysis = response.choices[0].message.content
+        analysis = _chat_completion(PERIOD_CHANGES_SYSTEM_PROMPT, prompt, max_tokens)
         logger.info("Successfully generated period comparison analysis")
         return analysis
 
     except Exception as e:
         logger.error(f"Error in analyze_period_changes: {str(e)}", exc_info=True)
-        return f"Error generating period comparison analysis: {str(e)}" 
\ No newline at end of file
+        raise 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+OpenAI Batch API path for latency-tolerant summaries.
+
+Batched requests cost half as much and do not count against the
+synchronous rate limits, but results can take up to a day. Completed
+results are written to the same completion cache the interactive
+summarizer reads, so a nightly batch run pre-warms the app.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import List, Dict, Optional
+
+from .settings import SUMMARIZER_MODEL
+from .summarizer import client, _cache_completion, _completion_key, _summary_messages
+
+# Use the root logger
+logger = logging.getLogger()
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+def submit_batch(prompts: List[Dict], model: str = SUMMARIZER_MODEL, temperature: float = 0.7) -> str:
+    """
+    Submit chat completion requests as a single batch job.
+
+    Args:
+        prompts: Requests as dictionaries with 'system', 'user' and
+            'max_tokens' keys
+        model: Model name
+        temperature: Sampling temperature
+
+    Returns:
+        str: The batch ID
+    """
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for prompt in prompts:
+                # The cache key doubles as the custom_id, so each result
+                # lands where _chat_completion will look for it
+                custom_id = _completion_key(prompt["system"], prompt["user"], prompt["max_tokens"], model, temperature)
+                f.write(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {
+                        "model": model,
+                        "messages": [
+                            {"role": "system", "content": prompt["system"]},
+                            {"role": "user", "content": prompt["user"]}
+                        ],
+                        "max_tokens": prompt["max_tokens"],
+                        "temperature": temperature
+                    }
+                }) + "\n")
+
+        with open(path, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+    finally:
+        os.remove(path)
+
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h"
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(prompts)} requests")
+    return batch.id
+
+def collect_batch(batch_id: str, poll_interval: float = 60.0, timeout: Optional[float] = None) -> Dict[str, str]:
+    """
+    Wait for a batch to finish and cache its completions.
+
+    Args:
+        batch_id: ID returned by submit_batch
+        poll_interval: Seconds between status checks
+        timeout: Maximum seconds to wait, or None to wait until the batch ends
+
+    Returns:
+        Dict[str, str]: Completion text by custom_id for every successful request
+
+    Raises:
+        RuntimeError: If the batch ends without completing
+        TimeoutError: If the batch is still running after timeout seconds
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout} seconds")
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+
+    results = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+            _cache_completion(record["custom_id"], content)
+            results[record["custom_id"]] = content
+
+    logger.info(f"Collected {len(results)} completions from batch {batch_id}")
+    return results
+
+def submit_summary_batch(text_lists: List[List[str]], prompt: str = None, max_tokens: int = 2000) -> str:
+    """
+    Queue summarize_themes requests for several review sets as one batch.
+
+    Once collect_batch has run, summarize_themes returns these summaries
+    from the cache without another API call.
+
+    Args:
+        text_lists: One list of review texts per summary
+        prompt: Optional custom prompt, shared by every summary
+        max_tokens: Maximum tokens for each response
+
+    Returns:
+        str: The batch ID
+    """
+    prompts = []
+    for texts in text_lists:
+        system, user = _summary_messages(texts, prompt)
+        prompts.append({"system": system, "user": user, "max_tokens": max_tokens})
+    return submit_batch(prompts)
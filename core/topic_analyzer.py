@@ -1,34 +1,72 @@
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
 from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Tuple
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 
-def extract_topics(texts: List[str], n_topics: int = 5) -> List[Tuple[str, float]]:
+def fit_topic_vectorizer(*text_sets: List[str]):
     """
-    Extract top N recurring topics from review texts using TF-IDF and clustering.
+    Fit one TF-IDF vectorizer over several review sets.
+    
+    Passing the result to extract_topics for each set puts them in the
+    same feature space, so topic labels can be matched between sets.
     
     Args:
-        texts: List of review texts
-        n_topics: Number of topics to extract
+        *text_sets: Lists of review texts
         
     Returns:
-        List of tuples containing (topic, frequency)
+        TfidfVectorizer: The fitted vectorizer
     """
-    # Create TF-IDF vectorizer
+    # scikit-learn is slow to import, so it is only loaded once topics are needed
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
     vectorizer = TfidfVectorizer(
         max_features=1000,
         stop_words='english',
         ngram_range=(1, 2)
     )
+    return vectorizer.fit([text for texts in text_sets for text in texts])
+
+def extract_topics(texts: List[str], n_topics: int = 5, vectorizer=None) -> List[Tuple[str, float]]:
+    """
+    Extract top N recurring topics from review texts using TF-IDF and clustering.
+    
+    Results are memoized per review set when no vectorizer is given, since
+    the period summary and the period-comparison prompt both extract
+    topics from the same reviews.
+    
+    Args:
+        texts: List of review texts
+        n_topics: Number of topics to extract
+        vectorizer: Optional fitted vectorizer from fit_topic_vectorizer;
+            by default one is fitted on texts alone
+        
+    Returns:
+        List of tuples containing (topic, frequency)
+    """
+    if vectorizer is None:
+        return list(_cached_topics(tuple(texts), n_topics))
+    # Callers fit a fresh vectorizer per comparison, so caching on its
+    # identity would never hit and would only keep it alive
+    return list(_extract_topics(texts, n_topics, vectorizer))
+
+@lru_cache(maxsize=32)
+def _cached_topics(texts: Tuple[str, ...], n_topics: int) -> Tuple[Tuple[str, float], ...]:
+    """Memoized _extract_topics with a vectorizer fitted on texts alone."""
+    return _extract_topics(texts, n_topics)
+
+def _extract_topics(texts: List[str], n_topics: int, vectorizer=None) -> Tuple[Tuple[str, float], ...]:
+    """Cluster TF-IDF vectors for extract_topics on one review set."""
+    from sklearn.cluster import MiniBatchKMeans
     
     # Transform texts to TF-IDF matrix
-    tfidf_matrix = vectorizer.fit_transform(texts)
+    if vectorizer is None:
+        vectorizer = fit_topic_vectorizer(texts)
+    tfidf_matrix = vectorizer.transform(texts)
     
     # Perform clustering
-    kmeans = KMeans(n_clusters=n_topics, random_state=42)
+    kmeans = MiniBatchKMeans(n_clusters=n_topics, batch_size=1024, n_init=3, random_state=42)
     clusters = kmeans.fit_predict(tfidf_matrix)
     
     # Get feature names
@@ -40,8 +78,10 @@ def extract_topics(texts: List[str], n_topics: int = 5) -> List[Tuple[str, float
         # Get cluster center
         center = kmeans.cluster_centers_[i]
         
-        # Get top terms for this cluster
-        top_indices = center.argsort()[-5:][::-1]
+        # Get top terms for this cluster: partial partition, then order just those
+        k = min(5, len(center))
+        top_indices = np.argpartition(center, -k)[-k:]
+        top_indices = top_indices[np.argsort(center[top_indices])[::-1]]
         top_terms = [feature_names[idx] for idx in top_indices]
         
         # Calculate frequency
@@ -50,7 +90,7 @@ def extract_topics(texts: List[str], n_topics: int = 5) -> List[Tuple[str, float
         
         topics.append((' '.join(top_terms), frequency))
     
-    return sorted(topics, key=lambda x: x[1], reverse=True)
+    return tuple(sorted(topics, key=lambda x: x[1], reverse=True))
 
 def analyze_topic_changes(current_texts: List[str], previous_texts: List[str], n_topics: int = 5) -> Dict[str, float]:
     """
@@ -64,9 +104,10 @@ def analyze_topic_changes(current_texts: List[str], previous_texts: List[str], n
     Returns:
         Dictionary mapping topics to their frequency change
     """
-    # Extract topics for both periods
-    current_topics = dict(extract_topics(current_texts, n_topics))
-    previous_topics = dict(extract_topics(previous_texts, n_topics))
+    # Extract topics for both periods in one shared feature space
+    vectorizer = fit_topic_vectorizer(current_texts, previous_texts)
+    current_topics = dict(extract_topics(current_texts, n_topics, vectorizer))
+    previous_topics = dict(extract_topics(previous_texts, n_topics, vectorizer))
     
     # Calculate changes
     changes = {}
@@ -79,6 +120,47 @@ def analyze_topic_changes(current_texts: List[str], previous_texts: List[str], n
     
     return changes
 
+# Theme keywords used to tag reviews
+THEME_KEYWORDS = {
+    'UX': ['interface', 'design', 'layout', 'user experience', 'ui', 'navigation', 'menu'],
+    'Performance': ['slow', 'lag', 'crash', 'freeze', 'speed', 'performance', 'battery'],
+    'Features': ['feature', 'function', 'option', 'capability', 'tool'],
+    'Bugs': ['bug', 'error', 'issue', 'problem', 'glitch', 'not working'],
+    'Content': ['content', 'information', 'data', 'update', 'news'],
+    'Support': ['support', 'help', 'customer service', 'response', 'contact']
+}
+THEME_NAMES = tuple(THEME_KEYWORDS)
+
+@lru_cache(maxsize=50_000)
+def _score_review_themes(text: str) -> Tuple[float, ...]:
+    """
+    Score a single review against every theme, in THEME_NAMES order.
+    
+    Cached per review text, so re-tagging an overlapping set of reviews
+    (e.g. after a small date range change) only scores the new ones.
+    """
+    lowered = text.lower()
+    return tuple(
+        # Calculate score based on keyword presence, normalized by number of keywords
+        sum(1 for keyword in keywords if keyword in lowered) / len(keywords)
+        for keywords in THEME_KEYWORDS.values()
+    )
+
+def theme_score_matrix(texts: List[str]) -> np.ndarray:
+    """
+    Score reviews against the predefined themes as a matrix.
+    
+    Args:
+        texts: Sequence of review texts (a list or a column's ndarray)
+        
+    Returns:
+        Array of shape (len(texts), len(THEME_NAMES)) with one row per review
+    """
+    scores = np.zeros((len(texts), len(THEME_NAMES)), dtype=np.float32)
+    for i, text in enumerate(texts):
+        scores[i] = _score_review_themes(text)
+    return scores
+
 def tag_reviews_by_theme(texts: List[str]) -> List[Dict[str, float]]:
     """
     Tag reviews with themes using predefined categories.
@@ -89,39 +171,7 @@ def tag_reviews_by_theme(texts: List[str]) -> List[Dict[str, float]]:
     Returns:
         List of dictionaries containing theme probabilities for each review
     """
-    # Define theme keywords
-    themes = {
-        'UX': ['interface', 'design', 'layout', 'user experience', 'ui', 'navigation', 'menu'],
-        'Performance': ['slow', 'lag', 'crash', 'freeze', 'speed', 'performance', 'battery'],
-        'Features': ['feature', 'function', 'option', 'capability', 'tool'],
-        'Bugs': ['bug', 'error', 'issue', 'problem', 'glitch', 'not working'],
-        'Content': ['content', 'information', 'data', 'update', 'news'],
-        'Support': ['support', 'help', 'customer service', 'response', 'contact']
-    }
-    
-    # Create TF-IDF vectorizer
-    vectorizer = TfidfVectorizer(
-        max_features=1000,
-        stop_words='english',
-        ngram_range=(1, 2)
-    )
-    
-    # Transform texts
-    tfidf_matrix = vectorizer.fit_transform(texts)
-    feature_names = vectorizer.get_feature_names_out()
-    
-    # Calculate theme probabilities for each review
-    theme_scores = []
-    for i in range(len(texts)):
-        review_scores = {}
-        for theme, keywords in themes.items():
-            # Calculate score based on keyword presence
-            score = sum(1 for keyword in keywords if keyword in texts[i].lower())
-            review_scores[theme] = score / len(keywords)  # Normalize by number of keywords
-        
-        theme_scores.append(review_scores)
-    
-    return theme_scores
+    return [dict(zip(THEME_NAMES, _score_review_themes(text))) for text in texts]
 
 def get_period_texts(df: pd.DataFrame, period_days: int) -> Tuple[List[str], List[str]]:
     """
@@ -134,16 +184,25 @@ def get_period_texts(df: pd.DataFrame, period_days: int) -> Tuple[List[str], Lis
     Returns:
         Tuple of (current_period_texts, previous_period_texts)
     """
-    # Convert date column to datetime if it's not already
-    df['date'] = pd.to_datetime(df['date'])
+    if len(df) == 0:
+        return [], []
+    
+    # analyze_all already returns 'date' as datetime64; parse anything else
+    # into a copy instead of the caller's frame
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df = df.assign(date=pd.to_datetime(df['date'], cache=True))
+    if not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable')
     
     # Get current period end date
-    end_date = df['date'].max()
-    current_start = end_date - timedelta(days=period_days)
-    previous_start = current_start - timedelta(days=period_days)
+    dates = df['date'].to_numpy(dtype='datetime64[ns]')
+    end_date = dates[-1]
+    current_start = end_date - np.timedelta64(period_days, 'D')
+    previous_start = current_start - np.timedelta64(period_days, 'D')
     
-    # Split into periods
-    current_period = df[df['date'] >= current_start]
-    previous_period = df[(df['date'] >= previous_start) & (df['date'] < current_start)]
+    # Split into periods: locate both boundaries on the sorted dates and slice
+    i_current = np.searchsorted(dates, current_start, side='left')
+    i_previous = np.searchsorted(dates, previous_start, side='left')
+    texts = df['text']
     
-    return current_period['text'].tolist(), previous_period['text'].tolist() 
\ No newline at end of file
+    return texts.iloc[i_current:].tolist(), texts.iloc[i_previous:i_current].tolist()
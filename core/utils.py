@@ -1,36 +1,179 @@
 from typing import List, Dict, Any, Callable
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import re
 import hashlib
 import os
+import sys
 import json
-from collections import Counter
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import pickle
+import sqlite3
+import tempfile
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
+from .settings import CACHE_DIR, SNAPSHOT_DIR
+
+# orjson is optional; it parses and serializes JSON natively when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Use the root logger
 logger = logging.getLogger()
 
+# Buffer size for snapshot and cache files, which run to megabytes; the
+# 8 KiB default splits them into hundreds of read/write syscalls
+IO_BUFFER_SIZE = 1024 * 1024
+
+# Snapshots are pickled; JSON files from older runs are still read
+SNAPSHOT_EXTENSIONS = ('.pkl', '.json')
+
+# Summaries live in one SQLite table, fronted by an in-memory LRU; per-key
+# JSON files from older runs are migrated into it on first read
+SUMMARY_DB_PATH = os.path.join(CACHE_DIR, "summaries.db")
+SUMMARY_MEMORY_SIZE = 256
+_summaries = OrderedDict()
+_summaries_lock = threading.Lock()
+_summary_db = threading.local()
+
+class RingBufferHandler(logging.Handler):
+    """
+    Handler that keeps the most recent log records in memory, unformatted.
+
+    Records are only formatted when dump() is called, so runs whose debug
+    output is never looked at skip the formatting work entirely.
+    """
+    def __init__(self, capacity: int = 2048):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Render tracebacks now so buffered records do not keep frames alive
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+    def clear(self) -> None:
+        self.records.clear()
+
+    def dump(self) -> str:
+        return '\n'.join(self.format(record) for record in self.records)
+
+def configure_logging(debug: bool = False) -> RingBufferHandler:
+    """
+    Configure the root logger for the app, replacing any existing handlers.
+    
+    Records go to stdout at INFO, or at DEBUG when debug is set. In debug
+    mode they are also kept in the returned ring buffer for the in-app
+    debug panel.
+    
+    Args:
+        debug: Enable DEBUG level and the in-memory buffer
+        
+    Returns:
+        RingBufferHandler: The debug buffer (empty unless debug is set)
+    """
+    root = logging.getLogger()
+    root.handlers = []
+    
+    level = logging.DEBUG if debug else logging.INFO
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    root.setLevel(level)
+    
+    # Add console handler for direct output
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
+    console_handler.setFormatter(formatter)
+    root.addHandler(console_handler)
+    
+    # Keep recent records in a bounded buffer, formatted only when displayed
+    log_buffer = RingBufferHandler()
+    if debug:
+        log_buffer.setLevel(logging.DEBUG)
+        log_buffer.setFormatter(formatter)
+        root.addHandler(log_buffer)
+    return log_buffer
+
+def read_json(path: str) -> Any:
+    """Load a JSON file, using orjson when it is available."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', buffering=IO_BUFFER_SIZE) as f:
+        return json.load(f)
+
+def write_json(path: str, data: Any) -> None:
+    """Write data to a JSON file, using orjson when it is available."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            # numpy scalars and arrays (e.g. computed metrics) serialize natively
+            f.write(orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w', buffering=IO_BUFFER_SIZE) as f:
+            json.dump(data, f, default=str)
+
 def merge_reviews(*review_lists: List[Dict]) -> List[Dict]:
     """Merge multiple lists of reviews into a single list."""
-    from itertools import chain
-    return list(chain(*review_lists))
+    # Allocate the result once at its final size, then copy each list in
+    merged = [None] * sum(map(len, review_lists))
+    start = 0
+    for reviews in review_lists:
+        merged[start:start + len(reviews)] = reviews
+        start += len(reviews)
+    return merged
+
+def dedupe_texts(texts: List[str]) -> List[str]:
+    """
+    Collapse exact duplicate review texts while preserving first-seen order.
+
+    Repeated texts are kept once and prefixed with their count so the
+    summarizer still sees how often a piece of feedback was given.
+
+    Args:
+        texts: List of review texts
+
+    Returns:
+        List[str]: Distinct texts, annotated with their multiplicity
+    """
+    counts = Counter(texts)
+    return [
+        text if count == 1 else f"(mentioned {count} times) {text}"
+        for text, count in counts.items()
+    ]
+
+def text_fingerprint(texts: List[str], digest_size: int = 12) -> str:
+    """
+    Compute a stable content hash for a list of texts.
+    
+    Args:
+        texts: List of texts to fingerprint
+        digest_size: Size of the digest in bytes
+        
+    Returns:
+        str: Hex digest identifying the exact text list
+    """
+    h = hashlib.blake2b(digest_size=digest_size)
+    for text in texts:
+        h.update(text.encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+# URLs and special characters (other than basic punctuation) removed in one scan
+_CLEAN_RE = re.compile(r'http\S+|www.\S+|[^\w\s.,!?-]')
 
 def clean_review_text(text: str) -> str:
     """Clean review text by removing special characters and extra whitespace."""
-    # Remove URLs
-    text = re.sub(r'http\S+|www.\S+', '', text)
-    
-    # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    # Remove URLs and special characters but keep basic punctuation
+    text = _CLEAN_RE.sub('', text)
     
     # Remove extra whitespace
-    text = ' '.join(text.split())
-    
-    return text.strip()
+    return ' '.join(text.split())
 
 def format_date(date_str: str) -> str:
     """Format date string to a consistent format."""
@@ -40,20 +183,118 @@ def format_date(date_str: str) -> str:
     except:
         return date_str
 
+def filter_date_range(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """
+    Select reviews with start_date <= date <= end_date.
+    
+    When the date column is already sorted the bounds are found by binary
+    search and a contiguous slice is returned; otherwise falls back to a
+    boolean mask.
+    
+    Args:
+        df: DataFrame with a datetime 'date' column
+        start_date: Inclusive lower bound
+        end_date: Inclusive upper bound
+        
+    Returns:
+        pd.DataFrame: Reviews within the date range
+    """
+    # Compare on the raw datetime64 values to stay on NumPy's C path
+    dates = df['date'].to_numpy(dtype='datetime64[ns]')
+    start, end = np.datetime64(start_date, 'ns'), np.datetime64(end_date, 'ns')
+    if df['date'].is_monotonic_increasing:
+        lo = dates.searchsorted(start, side='left')
+        hi = dates.searchsorted(end, side='right')
+        return df.iloc[lo:hi]
+    return df[(dates >= start) & (dates <= end)]
+
 def cache_key(texts: List[str], app_name: str = None) -> str:
     """Generate a cache key for a list of texts with app name."""
     try:
-        # Create a unique identifier using both app name and content
-        identifier = f"{app_name}_{''.join(texts)}" if app_name else "".join(texts)
-        cache_path = os.path.join("data/summaries", hashlib.md5(identifier.encode()).hexdigest() + ".json")
-        
-        # Ensure cache directory exists
-        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-        return cache_path
+        # Feed the app name and each text to the hash separately, with a
+        # separator byte, rather than building one concatenated string
+        h = hashlib.blake2b(digest_size=16)
+        if app_name:
+            h.update(app_name.encode())
+            h.update(b"\0")
+        for text in texts:
+            h.update(text.encode("utf-8", "ignore"))
+            h.update(b"\0")
+        # Summaries are stored in SQLite under this name; nothing is written
+        # to the path itself, so the directory need not exist
+        return os.path.join("data/summaries", h.hexdigest() + ".json")
     except Exception as e:
         logger.error(f"Error generating cache key: {str(e)}")
         return None
 
+def _legacy_cache_key(texts: List[str], app_name: str = None) -> str:
+    """Path older runs used for a summary, for migrating it to SQLite."""
+    identifier = f"{app_name}_{''.join(texts)}" if app_name else "".join(texts)
+    return os.path.join("data/summaries", hashlib.md5(identifier.encode()).hexdigest() + ".json")
+
+def _summary_connection() -> sqlite3.Connection:
+    """Open (once per thread) the summary database, creating it if needed."""
+    conn = getattr(_summary_db, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(SUMMARY_DB_PATH, timeout=30)
+        # WAL lets concurrent summary threads read while another writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT NOT NULL)")
+        _summary_db.conn = conn
+    return conn
+
+def _remember_summary(key: str, summary: str) -> None:
+    """Insert a summary into the in-memory LRU."""
+    with _summaries_lock:
+        _summaries[key] = summary
+        _summaries.move_to_end(key)
+        while len(_summaries) > SUMMARY_MEMORY_SIZE:
+            _summaries.popitem(last=False)
+
+def _load_summary(key: str, legacy_path: Callable[[], str]) -> str:
+    """
+    Look a summary up in memory, then SQLite, then its legacy JSON file.
+    
+    Args:
+        key: Summary cache key
+        legacy_path: Returns where older runs stored this summary as JSON;
+            only called on a miss
+        
+    Returns:
+        str: The cached summary, or None if there is none
+    """
+    with _summaries_lock:
+        if key in _summaries:
+            _summaries.move_to_end(key)
+            return _summaries[key]
+    
+    conn = _summary_connection()
+    row = conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+    if row is not None:
+        _remember_summary(key, row[0])
+        return row[0]
+    
+    path = legacy_path()
+    try:
+        summary = read_json(path).get("summary")
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error reading cache file: {str(e)}")
+        return None
+    if summary is not None:
+        logger.debug(f"Migrating legacy summary file {path}")
+        _store_summary(key, summary)
+    return summary
+
+def _store_summary(key: str, summary: str) -> None:
+    """Persist a summary to SQLite and remember it in memory."""
+    conn = _summary_connection()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)", (key, summary))
+    _remember_summary(key, summary)
+
 def cached_summary(texts: List[str], summarizer_func: Callable, app_name: str = None, **kwargs) -> str:
     """
     Get a cached summary or generate and cache a new one.
@@ -83,20 +324,16 @@ def cached_summary(texts: List[str], summarizer_func: Callable, app_name: str =
             return summarizer_func(texts, **kwargs)
             
         logger.debug(f"Cache path: {path}")
+        key = os.path.splitext(os.path.basename(path))[0]
             
         # Try to load from cache
-        if os.path.exists(path):
-            try:
-                logger.info("Attempting to load from cache...")
-                with open(path, 'r') as f:
-                    cached = json.load(f)
-                    if "summary" in cached:
-                        logger.info("Loaded summary from cache")
-                        return cached["summary"]
-                    else:
-                        logger.warning("Cache file exists but no summary found")
-            except Exception as e:
-                logger.error(f"Error reading cache file: {str(e)}")
+        try:
+            cached = _load_summary(key, lambda: _legacy_cache_key(texts, cache_params))
+            if cached is not None:
+                logger.info("Loaded summary from cache")
+                return cached
+        except Exception as e:
+            logger.error(f"Error reading summary cache: {str(e)}")
                 
         # Generate new summary
         logger.info("Generating new summary...")
@@ -107,9 +344,7 @@ def cached_summary(texts: List[str], summarizer_func: Callable, app_name: str =
                 
             # Cache the summary
             try:
-                os.makedirs(os.path.dirname(path), exist_ok=True)
-                with open(path, 'w') as f:
-                    json.dump({"summary": summary}, f)
+                _store_summary(key, summary)
                 logger.info("Summary cached successfully")
             except Exception as e:
                 logger.error(f"Error caching summary: {str(e)}")
@@ -122,20 +357,38 @@ def cached_summary(texts: List[str], summarizer_func: Callable, app_name: str =
         logger.error(f"Error in cached_summary: {str(e)}")
         raise
 
+def review_count(reviews) -> int:
+    """
+    Count reviews in either fetch format.
+    
+    Args:
+        reviews: Review columns from fetch_reviews, or a legacy list of
+            review dictionaries
+        
+    Returns:
+        int: Number of reviews
+    """
+    if isinstance(reviews, dict):
+        return len(reviews.get('review', ()))
+    return len(reviews)
+
 def store_snapshot(app_name: str, reviews: List[Dict], requested_count: int) -> None:
     """
     Store a snapshot of reviews for an app.
     
     Args:
         app_name: Name of the app
-        reviews: List of review dictionaries
+        reviews: Review columns as returned by fetch_reviews
         requested_count: Number of reviews that were requested
     """
     try:
-        date = datetime.now().strftime("%Y-%m-%d")
+        # One timestamp for both the file name and the header, so a write
+        # around midnight cannot disagree with itself
+        now = datetime.now()
+        date = now.strftime("%Y-%m-%d")
         # Use the app_name directly as the safe_app since it's already a safe identifier
         safe_app = app_name
-        path = f"data/snapshots/{safe_app}_{date}.json"
+        path = os.path.join(SNAPSHOT_DIR, f"{safe_app}_{date}.pkl")
         
         # Ensure snapshots directory exists
         try:
@@ -144,34 +397,44 @@ def store_snapshot(app_name: str, reviews: List[Dict], requested_count: int) ->
             logger.error(f"Error creating snapshots directory: {str(e)}")
             raise
         
-        # Check if we already have a snapshot
+        # Check if we already have a snapshot; its header comes first in
+        # the file, so this reads the count without unpickling the reviews
         if os.path.exists(path):
-            with open(path, 'r') as f:
-                existing_data = json.load(f)
-                if "reviews" in existing_data:
-                    existing_reviews = existing_data["reviews"]
+            with open(path, 'rb') as f:
+                existing_data = pickle.load(f)
+                existing_count = existing_data.get("review_count")
+                if existing_count is not None:
                     # If we have more reviews than requested, keep the existing ones
-                    if len(existing_reviews) >= len(reviews):
-                        logger.info(f"Keeping existing snapshot with {len(existing_reviews)} reviews")
+                    if existing_count >= review_count(reviews):
+                        logger.info(f"Keeping existing snapshot with {existing_count} reviews")
                         return
                     # If we have fewer reviews but more than requested, keep the existing ones
-                    if len(existing_reviews) >= requested_count:
-                        logger.info(f"Keeping existing snapshot with {len(existing_reviews)} reviews (meets requested count)")
+                    if existing_count >= requested_count:
+                        logger.info(f"Keeping existing snapshot with {existing_count} reviews (meets requested count)")
                         return
         
-        # Store the new snapshot
+        # Store the new snapshot: a small header pickle, then the reviews.
+        # Write to a temporary file and rename it into place, so an
+        # interrupted write never leaves a truncated snapshot behind. Each
+        # writer gets its own temporary file, since fetches run on threads
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{safe_app}_", suffix='.tmp', dir=os.path.dirname(path))
         try:
-            with open(path, 'w') as f:
-                json.dump({
+            with os.fdopen(fd, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                pickle.dump({
                     "app_name": app_name,
-                    "reviews": reviews,
-                    "review_count": len(reviews),
-                    "timestamp": datetime.now().isoformat(),
+                    "review_count": review_count(reviews),
+                    "timestamp": now.isoformat(),
                     "requested_count": requested_count
-                }, f, default=str)
-            logger.info(f"Successfully stored snapshot for {app_name} with {len(reviews)} reviews")
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(reviews, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            logger.info(f"Successfully stored snapshot for {app_name} with {review_count(reviews)} reviews")
         except Exception as e:
             logger.error(f"Error writing snapshot file: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
             raise
     except Exception as e:
         logger.error(f"Error storing snapshot for {app_name}: {str(e)}", exc_info=True)
@@ -185,23 +448,32 @@ def load_snapshot(app_name: str) -> List[Dict]:
         app_name: Name or ID of the app
         
     Returns:
-        List[Dict]: List of review dictionaries or None if no snapshot exists
+        Review columns (or a legacy list of review dictionaries), or None if
+        no snapshot exists
     """
     try:
         date = datetime.now().strftime("%Y-%m-%d")
         # Use the app_name directly as the safe_app since it's already a safe identifier
         safe_app = app_name
-        path = f"data/snapshots/{safe_app}_{date}.json"
         
-        if os.path.exists(path):
+        for ext in SNAPSHOT_EXTENSIONS:
+            path = os.path.join(SNAPSHOT_DIR, f"{safe_app}_{date}{ext}")
+            if not os.path.exists(path):
+                continue
             try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    if "reviews" in data:
-                        cached_reviews = data["reviews"]
-                        cached_count = len(cached_reviews)
-                        logger.info(f"Loaded {cached_count} reviews for {app_name}")
-                        return cached_reviews
+                if ext == '.pkl':
+                    with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                        # Skip the header; the reviews follow it
+                        pickle.load(f)
+                        cached_reviews = pickle.load(f)
+                else:
+                    data = read_json(path)
+                    if "reviews" not in data:
+                        continue
+                    cached_reviews = data["reviews"]
+                cached_count = review_count(cached_reviews)
+                logger.info(f"Loaded {cached_count} reviews for {app_name}")
+                return cached_reviews
             except json.JSONDecodeError as e:
                 logger.error(f"Error decoding snapshot JSON for {app_name}: {str(e)}")
                 return None
@@ -222,12 +494,18 @@ def calculate_response_time(df: pd.DataFrame) -> pd.Series:
             logger.warning("Missing date columns for response time calculation")
             return pd.Series()
         
-        # Convert dates to datetime
-        df['date'] = pd.to_datetime(df['date'])
-        df['reply_date'] = pd.to_datetime(df['reply_date'])
+        # analyze_all already returns both date columns as datetime64, which
+        # these leave as-is; other inputs are parsed into locals rather than
+        # written back into the caller's frame
+        dates = df['date']
+        reply_dates = df['reply_date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, cache=True, errors='coerce')
+        if not pd.api.types.is_datetime64_any_dtype(reply_dates):
+            reply_dates = pd.to_datetime(reply_dates, cache=True, errors='coerce')
         
         # Calculate response time in days
-        response_times = (df['reply_date'] - df['date']).dt.days
+        response_times = (reply_dates - dates).dt.days
         
         return response_times
     except Exception as e:
@@ -237,50 +515,74 @@ def calculate_response_time(df: pd.DataFrame) -> pd.Series:
 def get_top_keywords(texts: List[str], n: int = 10) -> List[str]:
     """Extract top keywords from review texts."""
     try:
-        # Download required NLTK data
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-        
-        # Get stopwords
-        stop_words = set(stopwords.words('english'))
+        # scikit-learn is slow to import, so it is only loaded once keywords are needed
+        from sklearn.feature_extraction.text import CountVectorizer
         
-        # Tokenize and count words
-        words = []
-        for text in texts:
-            words.extend(word_tokenize(text.lower()))
-        
-        # Filter out stopwords and non-alphabetic words
-        words = [word for word in words if word.isalpha() and word not in stop_words]
+        # Tokenize into alphabetic words, dropping stopwords, and count them
+        vectorizer = CountVectorizer(stop_words='english', token_pattern=r'[^\W\d_]+', lowercase=True)
+        try:
+            matrix = vectorizer.fit_transform(texts)
+        except ValueError:
+            # No texts, or nothing but stopwords
+            return []
+        counts = np.asarray(matrix.sum(axis=0)).ravel()
         
-        # Get most common words
-        word_counts = Counter(words)
-        return [word for word, _ in word_counts.most_common(n)]
+        # Get most common words: partial partition, then order just those
+        k = min(n, counts.size)
+        top_indices = np.argpartition(counts, -k)[-k:]
+        top_indices = top_indices[np.argsort(-counts[top_indices], kind='stable')]
+        feature_names = vectorizer.get_feature_names_out()
+        return [feature_names[idx] for idx in top_indices]
     except Exception as e:
         logger.error(f"Error getting top keywords: {str(e)}", exc_info=True)
         return []
 
+def load_snapshots(app_names: List[str]) -> Dict[str, Any]:
+    """
+    Load today's snapshots for several apps concurrently.
+    
+    Each load is independent and mostly file I/O, so threads overlap them.
+    
+    Args:
+        app_names: Names or IDs of the apps
+        
+    Returns:
+        Dict mapping each app to its reviews, or None if it has no snapshot
+    """
+    if not app_names:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(32, len(app_names))) as executor:
+        return dict(zip(app_names, executor.map(load_snapshot, app_names)))
+
 def clear_cache() -> None:
     """
     Clear all cached summary files.
     """
     try:
+        # Completions are only held in memory once the summarizer is loaded;
+        # importing it here would build the OpenAI client just to clear it
+        summarizer = sys.modules.get(f"{__package__}.summarizer")
+        if summarizer is not None:
+            summarizer.clear_completion_cache()
+        with _summaries_lock:
+            _summaries.clear()
+        if os.path.exists(SUMMARY_DB_PATH):
+            conn = _summary_connection()
+            with conn:
+                conn.execute("DELETE FROM summaries")
         if os.path.exists(CACHE_DIR):
-            for filename in os.listdir(CACHE_DIR):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(CACHE_DIR, filename)
-                    os.remove(file_path)
-                    logger.info(f"Removed cache file: {filename}")
+            with os.scandir(CACHE_DIR) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json') and entry.is_file():
+                        os.unlink(entry.path)
+                        logger.debug(f"Removed cache file: {entry.name}")
             logger.info("Cache cleared successfully")
     except Exception as e:
         logger.error(f"Error clearing cache: {str(e)}", exc_info=True)
         raise
 
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
 def clear_snapshots(days_to_keep: int = 7) -> None:
     """
     Clear old snapshot files, keeping only those from the last N days.
@@ -295,22 +597,24 @@ def clear_snapshots(days_to_keep: int = 7) -> None:
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
         cutoff_str = cutoff_date.strftime("%Y-%m-%d")
         
-        for filename in os.listdir(SNAPSHOT_DIR):
-            if not filename.endswith('.json'):
-                continue
-                
-            # Extract date from filename (format: appname_YYYY-MM-DD.json)
-            try:
-                date_str = filename.split('_')[-1].replace('.json', '')
-                file_date = datetime.strptime(date_str, "%Y-%m-%d")
+        with os.scandir(SNAPSHOT_DIR) as entries:
+            for entry in entries:
+                filename = entry.name
+                stem, ext = os.path.splitext(filename)
+                if ext not in SNAPSHOT_EXTENSIONS:
+                    continue
+                    
+                # Extract date from filename (format: appname_YYYY-MM-DD.pkl);
+                # ISO dates order the same as strings, so no parsing is needed.
+                # A file dated on the cutoff day is older than the cutoff time.
+                date_str = stem.rpartition('_')[2]
+                if not _ISO_DATE_RE.fullmatch(date_str):
+                    logger.warning(f"Could not parse date from filename {filename}")
+                    continue
                 
-                if file_date < cutoff_date:
-                    file_path = os.path.join(SNAPSHOT_DIR, filename)
-                    os.remove(file_path)
+                if date_str <= cutoff_str:
+                    os.remove(entry.path)
                     logger.info(f"Removed old snapshot: {filename}")
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Could not parse date from filename {filename}: {str(e)}")
-                continue
                 
         logger.info(f"Successfully cleaned up snapshots older than {days_to_keep} days")
     except Exception as e:
@@ -332,44 +636,48 @@ def get_snapshot_info() -> Dict[str, Any]:
                 "apps": {}
             }
             
+        total_snapshots = 0
         total_size = 0
         apps = {}
         
-        for filename in os.listdir(SNAPSHOT_DIR):
-            if not filename.endswith('.json'):
-                continue
-                
-            file_path = os.path.join(SNAPSHOT_DIR, filename)
-            file_size = os.path.getsize(file_path)
-            total_size += file_size
-            
-            # Extract app name and date
-            try:
-                app_name = '_'.join(filename.split('_')[:-1])
-                date_str = filename.split('_')[-1].replace('.json', '')
-                
-                if app_name not in apps:
-                    apps[app_name] = {
-                        "snapshots": 0,
-                        "total_size": 0,
-                        "latest_date": None
-                    }
+        with os.scandir(SNAPSHOT_DIR) as entries:
+            for entry in entries:
+                filename = entry.name
+                stem, ext = os.path.splitext(filename)
+                if ext not in SNAPSHOT_EXTENSIONS:
+                    continue
                     
-                apps[app_name]["snapshots"] += 1
-                apps[app_name]["total_size"] += file_size
+                total_snapshots += 1
+                file_size = entry.stat().st_size
+                total_size += file_size
                 
-                # Update latest date if this snapshot is newer
-                snapshot_date = datetime.strptime(date_str, "%Y-%m-%d")
-                if (apps[app_name]["latest_date"] is None or 
-                    snapshot_date > apps[app_name]["latest_date"]):
-                    apps[app_name]["latest_date"] = snapshot_date
+                # Extract app name and date
+                try:
+                    app_name = '_'.join(stem.split('_')[:-1])
+                    date_str = stem.split('_')[-1]
                     
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Could not parse filename {filename}: {str(e)}")
-                continue
+                    if app_name not in apps:
+                        apps[app_name] = {
+                            "snapshots": 0,
+                            "total_size": 0,
+                            "latest_date": None
+                        }
+                        
+                    apps[app_name]["snapshots"] += 1
+                    apps[app_name]["total_size"] += file_size
+                    
+                    # Update latest date if this snapshot is newer
+                    snapshot_date = datetime.strptime(date_str, "%Y-%m-%d")
+                    if (apps[app_name]["latest_date"] is None or 
+                        snapshot_date > apps[app_name]["latest_date"]):
+                        apps[app_name]["latest_date"] = snapshot_date
+                        
+                except (ValueError, IndexError) as e:
+                    logger.warning(f"Could not parse filename {filename}: {str(e)}")
+                    continue
                 
         return {
-            "total_snapshots": len([f for f in os.listdir(SNAPSHOT_DIR) if f.endswith('.json')]),
+            "total_snapshots": total_snapshots,
             "total_size": total_size,
             "apps": apps
         }
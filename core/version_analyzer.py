@@ -2,41 +2,58 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 from datetime import datetime
-from .topic_analyzer import extract_topics, tag_reviews_by_theme
+from .topic_analyzer import extract_topics, fit_topic_vectorizer, theme_score_matrix, THEME_NAMES
 import re
 
+# Common version patterns, tried in order
+VERSION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'version\s+(\d+\.\d+(?:\.\d+)?)',  # version 1.2.3
+    r'v(\d+\.\d+(?:\.\d+)?)',          # v1.2.3
+    r'(\d+\.\d+(?:\.\d+)?)\s+version', # 1.2.3 version
+    r'update\s+(\d+\.\d+(?:\.\d+)?)',  # update 1.2.3
+))
+
+# Every pattern needs a dotted number, so one scan rules most reviews out
+VERSION_NUMBER_RE = re.compile(r'\d+\.\d')
+
 def extract_version_from_review(review_text: str) -> str:
     """
     Extract version number from review text using common patterns.
     """
-    # Common version patterns
-    patterns = [
-        r'version\s+(\d+\.\d+(?:\.\d+)?)',  # version 1.2.3
-        r'v(\d+\.\d+(?:\.\d+)?)',          # v1.2.3
-        r'(\d+\.\d+(?:\.\d+)?)\s+version', # 1.2.3 version
-        r'update\s+(\d+\.\d+(?:\.\d+)?)',  # update 1.2.3
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, review_text.lower())
+    if not VERSION_NUMBER_RE.search(review_text):
+        return None
+    text = review_text.lower()
+    for pattern in VERSION_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     return None
 
+def version_sort_key(version: str) -> Tuple[int, ...]:
+    """
+    Sort key for a "major.minor[.patch]" version: its numeric components.
+    
+    Tuples compare component by component with no width limit, so
+    build-number style versions such as 1.2.20240601 still order correctly.
+    """
+    return tuple(map(int, version.split('.')))
+
 def group_reviews_by_version(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     """
     Group reviews by version number.
     """
     # Extract versions from review texts
-    df['version'] = df['text'].apply(extract_version_from_review)
-    
-    # Group by version
-    version_groups = {}
-    for version, group in df.groupby('version'):
-        if version:  # Only include reviews with detected versions
-            version_groups[version] = group
+    df['version'] = df['text'].map(extract_version_from_review)
     
-    return version_groups
+    # Group by version; groupby drops reviews without a detected version
+    return dict(tuple(df.groupby('version')))
+
+def _theme_averages(texts: List[str]) -> Dict[str, float]:
+    """Mean score of each theme over a set of reviews (0 for no reviews)."""
+    if not texts:
+        return dict.fromkeys(THEME_NAMES, 0)
+    means = theme_score_matrix(texts).mean(axis=0, dtype=np.float64)
+    return dict(zip(THEME_NAMES, means.tolist()))
 
 def compare_versions(version1: pd.DataFrame, version2: pd.DataFrame) -> Dict[str, Dict]:
     """
@@ -50,15 +67,20 @@ def compare_versions(version1: pd.DataFrame, version2: pd.DataFrame) -> Dict[str
     }
     
     # Compare sentiment
+    sentiment1 = version1['sentiment'].mean()
+    sentiment2 = version2['sentiment'].mean()
     comparison['sentiment'] = {
-        'version1': version1['sentiment'].mean(),
-        'version2': version2['sentiment'].mean(),
-        'delta': version2['sentiment'].mean() - version1['sentiment'].mean()
+        'version1': sentiment1,
+        'version2': sentiment2,
+        'delta': sentiment2 - sentiment1
     }
     
-    # Compare topics
-    topics1 = dict(extract_topics(version1['text'].tolist()))
-    topics2 = dict(extract_topics(version2['text'].tolist()))
+    # Compare topics in one shared feature space
+    texts1 = version1['text'].tolist()
+    texts2 = version2['text'].tolist()
+    vectorizer = fit_topic_vectorizer(texts1, texts2)
+    topics1 = dict(extract_topics(texts1, vectorizer=vectorizer))
+    topics2 = dict(extract_topics(texts2, vectorizer=vectorizer))
     
     all_topics = set(topics1.keys()) | set(topics2.keys())
     topic_changes = {}
@@ -72,17 +94,9 @@ def compare_versions(version1: pd.DataFrame, version2: pd.DataFrame) -> Dict[str
         }
     comparison['topics'] = topic_changes
     
-    # Compare themes
-    themes1 = tag_reviews_by_theme(version1['text'].tolist())
-    themes2 = tag_reviews_by_theme(version2['text'].tolist())
-    
-    theme_avgs1 = {}
-    theme_avgs2 = {}
-    for theme in ['UX', 'Performance', 'Features', 'Bugs', 'Content', 'Support']:
-        scores1 = [score[theme] for score in themes1]
-        scores2 = [score[theme] for score in themes2]
-        theme_avgs1[theme] = sum(scores1) / len(scores1) if scores1 else 0
-        theme_avgs2[theme] = sum(scores2) / len(scores2) if scores2 else 0
+    # Compare themes: average every theme column of the score matrix at once
+    theme_avgs1 = _theme_averages(texts1)
+    theme_avgs2 = _theme_averages(texts2)
     
     theme_changes = {}
     for theme in theme_avgs1.keys():
@@ -94,6 +108,8 @@ def compare_versions(version1: pd.DataFrame, version2: pd.DataFrame) -> Dict[str
     comparison['themes'] = theme_changes
     
     # Compare metrics
+    rating1 = version1['rating'].mean()
+    rating2 = version2['rating'].mean()
     comparison['metrics'] = {
         'review_count': {
             'version1': len(version1),
@@ -101,9 +117,9 @@ def compare_versions(version1: pd.DataFrame, version2: pd.DataFrame) -> Dict[str
             'delta': len(version2) - len(version1)
         },
         'average_rating': {
-            'version1': version1['rating'].mean(),
-            'version2': version2['rating'].mean(),
-            'delta': version2['rating'].mean() - version1['rating'].mean()
+            'version1': rating1,
+            'version2': rating2,
+            'delta': rating2 - rating1
         }
     }
     
@@ -114,17 +130,14 @@ def get_version_timeline(df: pd.DataFrame) -> List[Dict]:
     Create a timeline of version releases based on review dates.
     """
     # Extract versions and their first appearance dates
-    version_dates = {}
-    for _, row in df.iterrows():
-        version = extract_version_from_review(row['text'])
-        if version:
-            if version not in version_dates or row['date'] < version_dates[version]:
-                version_dates[version] = row['date']
+    versions = df['text'].map(extract_version_from_review)
+    first_dates = df['date'].groupby(versions, sort=False).min()
     
     # Sort versions by date
+    first_dates = first_dates.sort_values(kind='stable')
     timeline = [
         {'version': version, 'date': date}
-        for version, date in sorted(version_dates.items(), key=lambda x: x[1])
+        for version, date in zip(first_dates.index, first_dates)
     ]
     
     return timeline 
\ No newline at end of file
@@ -0,0 +1,32 @@
+import os
+import sys
+
+# The summarizer builds its OpenAI client on import; no request is ever sent
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import summarizer
+
+
+def test_summarize_themes_multi_keeps_model_subheadings(monkeypatch):
+    response = (
+        "### Version 1.2\n"
+        "Users are mostly happy.\n"
+        "\n"
+        "### Issues\n"
+        "- Login fails after the update\n"
+        "\n"
+        "### Version 1.3\n"
+        "Crashes dominate the feedback.\n"
+    )
+    monkeypatch.setattr(summarizer, "_chat_completion", lambda *args, **kwargs: response)
+
+    summaries = summarizer.summarize_themes_multi(
+        [["Great app"], ["Keeps crashing"]],
+        ["Version 1.2", "Version 1.3"]
+    )
+
+    assert summaries == {
+        "Version 1.2": "Users are mostly happy.\n\n### Issues\n- Login fails after the update",
+        "Version 1.3": "Crashes dominate the feedback."
+    }